@@ -0,0 +1,71 @@
+"""Times the construction of reconciliation plans for increasingly wide
+tables. Nothing is collected, only the column planning and the building of
+the lazy query are measured, so the time per column should stay flat as the
+number of columns grows.
+
+    python benchmarks/planning.py --widths 1250 2500 5000 10000
+"""
+
+import argparse
+import time
+
+import polars as pl
+
+from datarec import tables
+
+
+def wide_table(n_columns: int) -> pl.LazyFrame:
+    return pl.LazyFrame(
+        {"key": [0, 1]}
+        | {"column_%d" % i: [0.0, 1.0] for i in range(n_columns)}
+    )
+
+
+def time_planning(method, n_columns: int, repeat: int) -> float:
+    p1 = wide_table(n_columns)
+    p2 = wide_table(n_columns)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        method(
+            p1,
+            p2,
+            column_indexes=[0],
+            materialize="never",
+            validate_index="off",
+        )
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--widths",
+        type=int,
+        nargs="+",
+        default=[625, 1250, 2500, 5000, 10000],
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    methods = dict(
+        is_equal=tables.is_equal, is_close_numeric=tables.is_close_numeric
+    )
+
+    print(
+        "%-18s %8s %10s %14s" % ("method", "columns", "seconds", "us/column")
+    )
+    for name, method in methods.items():
+        for n_columns in args.widths:
+            seconds = time_planning(method, n_columns, args.repeat)
+            print(
+                "%-18s %8d %10.3f %14.1f"
+                % (name, n_columns, seconds, 1e6 * seconds / n_columns)
+            )
+
+
+if __name__ == "__main__":
+    main()
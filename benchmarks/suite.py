@@ -0,0 +1,281 @@
+"""Times and memory profiles the reconciliation hot paths on synthetic tables
+and reports the results as JSON.
+
+The inputs of every size are generated once and written to temporary Arrow IPC
+files. Every measurement runs in a fresh process which only reads them, so
+that its peak resident memory is not hidden by the peak of the generation.
+
+By default the row count is swept at 10 columns and the column count is
+swept at 10,000 rows. Passing both --rows and --columns measures every
+combination.
+
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --rows 1e4 1e5 --columns 10 100 \\
+        --cases is_equal_indexed summarize_reconciliation
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import pathlib as pt
+import datetime as dt
+import multiprocessing
+from importlib import metadata
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import polars as pl
+
+from datarec import tables
+from datarec.utils.functions import group_suffixed, validate_index_columns
+
+try:
+    from benchmarks.synthetic import index_columns, paired_tables
+except ImportError:
+    sys.path.append(pt.Path(__file__).parent.parent.absolute().as_posix())
+    from benchmarks.synthetic import index_columns, paired_tables
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+default_rows = [10**4, 10**5, 10**6, 10**7, 10**8]
+default_columns = [10, 100, 1000, 5000]
+
+column_indexes = range(len(index_columns))
+
+
+def _is_equal_indexed(left: pl.DataFrame, right: pl.DataFrame) -> Callable:
+    return lambda: tables.is_equal(
+        left.lazy(), right.lazy(), column_indexes=column_indexes
+    ).results.collect()
+
+
+def _is_equal_no_index(left: pl.DataFrame, right: pl.DataFrame) -> Callable:
+    return lambda: tables.is_equal(left.lazy(), right.lazy()).results.collect()
+
+
+def _is_close_numeric_indexed(
+    left: pl.DataFrame, right: pl.DataFrame
+) -> Callable:
+    return lambda: tables.is_close_numeric(
+        left.lazy(), right.lazy(), column_indexes=column_indexes
+    ).results.collect()
+
+
+def _is_close_numeric_no_index(
+    left: pl.DataFrame, right: pl.DataFrame
+) -> Callable:
+    return lambda: tables.is_close_numeric(
+        left.lazy(), right.lazy()
+    ).results.collect()
+
+
+def _validate_index_columns(
+    left: pl.DataFrame, right: pl.DataFrame
+) -> Callable:
+    return lambda: validate_index_columns(
+        left.lazy(), column_indexes, "left", validate_index="full"
+    )
+
+
+def _group_suffixed(left: pl.DataFrame, right: pl.DataFrame) -> Callable:
+    # the column names of a reconciliation before they are interlaced
+    columns = (
+        tables.is_equal(
+            left.lazy(),
+            right.lazy(),
+            column_indexes=column_indexes,
+            interlaced=False,
+            materialize="never",
+            validate_index="off",
+        )
+        .results.collect_schema()
+        .names()
+    )
+    return lambda: group_suffixed(columns)
+
+
+def _summarize_reconciliation(
+    left: pl.DataFrame, right: pl.DataFrame
+) -> Callable:
+    reconciliation = tables.is_equal(
+        left.lazy(), right.lazy(), column_indexes=column_indexes
+    )
+    reconciliation.results = reconciliation.results.collect().lazy()
+    return lambda: tables.summarize_reconciliation(reconciliation)
+
+
+# every case prepares its inputs outside of the timing and returns the
+# function which is timed
+cases = {
+    "is_equal_indexed": _is_equal_indexed,
+    "is_equal_no_index": _is_equal_no_index,
+    "is_close_numeric_indexed": _is_close_numeric_indexed,
+    "is_close_numeric_no_index": _is_close_numeric_no_index,
+    "validate_index_columns": _validate_index_columns,
+    "group_suffixed": _group_suffixed,
+    "summarize_reconciliation": _summarize_reconciliation,
+}
+
+
+def _peak_rss() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # linux reports kilobytes and macos bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _measure(
+    case: str, left_path: str, right_path: str, repeat: int
+) -> Dict[str, Any]:
+    left = pl.read_ipc(left_path, memory_map=False)
+    right = pl.read_ipc(right_path, memory_map=False)
+    run = cases[case](left, right)
+
+    baseline = _peak_rss()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    peak = _peak_rss()
+
+    return dict(
+        seconds=min(timings),
+        seconds_all=timings,
+        n_rows_left=len(left),
+        n_rows_right=len(right),
+        peak_rss_bytes=peak,
+        # the increase of the peak over the peak reached while reading the
+        # inputs and preparing the case
+        peak_rss_increase_bytes=(
+            None if peak is None else max(0, peak - baseline)
+        ),
+    )
+
+
+def _measure_isolated(*args) -> Dict[str, Any]:
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        try:
+            return executor.submit(_measure, *args).result()
+        except Exception as e:
+            # a failed or killed measurement, e.g. out of memory, is reported
+            # without stopping the suite
+            return dict(error="%s: %s" % (type(e).__name__, e))
+
+
+def _version(package: str) -> str:
+    try:
+        return metadata.version(package)
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _sizes(args: argparse.Namespace) -> List[tuple]:
+    if args.rows is None and args.columns is None:
+        sizes = [(r, 10) for r in default_rows]
+        sizes += [(10**4, c) for c in default_columns if c != 10]
+    else:
+        rows = args.rows or [10**4]
+        columns = args.columns or [10]
+        sizes = [(r, c) for r in rows for c in columns]
+
+    if args.max_cells is not None:
+        sizes = [(r, c) for r, c in sizes if r * c <= args.max_cells]
+
+    return sizes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows", type=lambda s: int(float(s)), nargs="+", default=None
+    )
+    parser.add_argument("--columns", type=int, nargs="+", default=None)
+    parser.add_argument(
+        "--cases", nargs="+", choices=list(cases), default=list(cases)
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--max-cells",
+        type=lambda s: int(float(s)),
+        default=None,
+        help="skip the sizes with more rows times columns",
+    )
+    parser.add_argument("--key-cardinality", type=int, default=1000)
+    parser.add_argument("--mismatch-rate", type=float, default=0.001)
+    parser.add_argument("--null-rate", type=float, default=0.01)
+    parser.add_argument("--left-only", type=float, default=0.001)
+    parser.add_argument("--right-only", type=float, default=0.001)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="defaults to stdout")
+    args = parser.parse_args()
+
+    generator = dict(
+        key_cardinality=args.key_cardinality,
+        mismatch_rate=args.mismatch_rate,
+        null_rate=args.null_rate,
+        left_only=args.left_only,
+        right_only=args.right_only,
+        seed=args.seed,
+    )
+
+    results = []
+    for n_rows, n_columns in _sizes(args):
+        with tempfile.TemporaryDirectory() as directory:
+            left_path = pt.Path(directory, "left.arrow").as_posix()
+            right_path = pt.Path(directory, "right.arrow").as_posix()
+
+            # the inputs are streamed to disk, neither the suite nor the
+            # measurements hold the generation in memory
+            left, right = paired_tables(n_rows, n_columns, **generator)
+            left.sink_ipc(left_path, engine="streaming")
+            right.sink_ipc(right_path, engine="streaming")
+
+            for case in args.cases:
+                print(
+                    "%-28s %12d rows %6d columns" % (case, n_rows, n_columns),
+                    file=sys.stderr,
+                )
+                measurement = _measure_isolated(
+                    case, left_path, right_path, args.repeat
+                )
+                results.append(
+                    dict(
+                        case=case,
+                        n_rows=n_rows,
+                        n_columns=n_columns,
+                        **measurement,
+                    )
+                )
+
+    report = dict(
+        created=dt.datetime.now(dt.timezone.utc).isoformat(),
+        environment=dict(
+            datarec=_version("datarec"),
+            polars=pl.__version__,
+            python=platform.python_version(),
+            platform=platform.platform(),
+            cpu_count=multiprocessing.cpu_count(),
+        ),
+        generator=dict(generator, repeat=args.repeat),
+        results=results,
+    )
+
+    if args.output is None:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Deterministic synthetic pairs of tables for the benchmarks.
+
+Every value is derived from the hash of its row number and a seed, so the
+tables are generated lazily, in parallel, without any data held in python,
+and the same parameters always give the same tables on a given polars
+version.
+"""
+
+from typing import Tuple
+
+import polars as pl
+
+# the key columns come first, the index of the generated tables is range(2)
+index_columns = ["key", "sequence"]
+
+
+def _uniform(seed: int, stream: int) -> pl.Expr:
+    """A uniform value in [0, 1) for every row, independent across streams."""
+    return (pl.col("row").hash(seed, stream) // 2**11).cast(
+        pl.Float64
+    ) / 2.0**53
+
+
+def paired_tables(
+    n_rows: int,
+    n_columns: int,
+    key_cardinality: int = 1000,
+    mismatch_rate: float = 0.001,
+    null_rate: float = 0.01,
+    left_only: float = 0.001,
+    right_only: float = 0.001,
+    seed: int = 0,
+) -> Tuple[pl.LazyFrame, pl.LazyFrame]:
+    """Generates a left and a right table which differ in a controlled way.
+
+    Both tables are indexed by a key, with key_cardinality distinct values,
+    and a sequence number which makes the index unique. The value columns are
+    floats, a fraction mismatch_rate of the right values are shifted away from
+    the left ones, and a fraction null_rate of the values are missing on both
+    sides.
+
+    Args:
+        n_rows (int): the number of rows shared by both tables before the
+        one sided rows are removed.
+
+        n_columns (int): the number of value columns.
+
+        key_cardinality (int, optional): the number of distinct keys.
+
+        mismatch_rate (float, optional): the fraction of the right values
+        which differ from the left ones.
+
+        null_rate (float, optional): the fraction of missing values.
+
+        left_only (float, optional): the fraction of rows only found in the
+        left table.
+
+        right_only (float, optional): the fraction of rows only found in the
+        right table.
+
+        seed (int, optional): the seed of the generator.
+
+    Returns:
+        Tuple[pl.LazyFrame, pl.LazyFrame]: the left and right tables.
+    """
+    assert 0 <= left_only + right_only <= 1, "too many one sided rows"
+
+    base = pl.LazyFrame().select(
+        pl.int_range(n_rows, dtype=pl.UInt64).alias("row")
+    )
+
+    # every value column draws from three streams, one for its value, one for
+    # being missing and one for differing on the right
+    def value(i: int) -> pl.Expr:
+        return pl.when(_uniform(seed, 3 * i + 2) >= null_rate).then(
+            _uniform(seed, 3 * i + 1) * 1000
+        )
+
+    def shifted(i: int) -> pl.Expr:
+        shift = pl.when(_uniform(seed, 3 * i + 3) < mismatch_rate)
+        return value(i) + shift.then(1.0).otherwise(0.0)
+
+    keys = [
+        (pl.col("row") % key_cardinality).alias("key"),
+        (pl.col("row") // key_cardinality).alias("sequence"),
+    ]
+
+    # the rows below left_only are only found on the left, the ones between
+    # left_only and left_only + right_only only on the right
+    side = _uniform(seed, 0)
+    is_right_only = (side >= left_only) & (side < left_only + right_only)
+
+    left = base.filter(is_right_only.not_()).select(
+        keys + [value(i).alias("value_%d" % i) for i in range(n_columns)]
+    )
+    right = base.filter(side >= left_only).select(
+        keys + [shifted(i).alias("value_%d" % i) for i in range(n_columns)]
+    )
+
+    return left, right
@@ -1,6 +1,8 @@
 from . import utils
 from . import data
 from . import tables
+from . import batch
+from . import sql
 
 
-__all__ = ["utils", "data", "tables"]
+__all__ = ["utils", "data", "tables", "batch", "sql"]
@@ -0,0 +1,185 @@
+import importlib
+import pathlib as pt
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+
+import polars as pl
+import yaml
+
+from .data import (
+    ReconciliationJob,
+    TableReconciliationData,
+    TableReconciliationSummarizationData,
+)
+from .tables._partitioned import method_map, _check_method
+from .tables._summarizer import _moments_query, _summary_from_moments
+
+scanners = {
+    ".parquet": pl.scan_parquet,
+    ".csv": pl.scan_csv,
+    ".ipc": pl.scan_ipc,
+    ".arrow": pl.scan_ipc,
+    ".feather": pl.scan_ipc,
+    ".ndjson": pl.scan_ndjson,
+}
+
+
+def _run_job(
+    job: ReconciliationJob, collect_results: bool
+) -> Tuple[TableReconciliationData, TableReconciliationSummarizationData]:
+    _check_method(job.method)
+
+    reconciliation = method_map[job.method](
+        job.left(),
+        job.right(),
+        column_indexes=job.column_indexes,
+        **job.kwargs,
+    )
+
+    queries = [
+        _moments_query(reconciliation.results, roles=reconciliation.roles)
+    ]
+    if collect_results:
+        queries.append(reconciliation.results)
+
+    engine = "streaming" if reconciliation.streaming else "auto"
+
+    # the results and the summary moments share a single pass over the plan
+    collected = pl.collect_all(queries, engine=engine)
+
+    if collect_results:
+        reconciliation.results = collected[1].lazy()
+        reconciliation.unsorted_results = None
+
+    summary = _summary_from_moments(
+        collected[0], job.join, reconciliation.sample_fraction
+    )
+
+    return reconciliation, summary
+
+
+def run_batch(
+    jobs: Iterable[ReconciliationJob],
+    max_workers: Optional[int] = 4,
+    collect_results: bool = True,
+) -> Dict[
+    str, Tuple[TableReconciliationData, TableReconciliationSummarizationData]
+]:
+    """Runs many reconciliations concurrently in a bounded thread pool.
+
+    Every job is planned and collected in its own thread. Polars releases the
+    GIL while collecting, so the queries of independent jobs run side by side
+    on the shared polars thread pool and the batch takes about as long as its
+    longest job.
+
+    Args:
+        jobs (Iterable[ReconciliationJob]): the reconciliations to run, the job
+        names must be unique.
+
+        max_workers (int, optional): the number of jobs running at once.
+
+        collect_results (bool, optional): collect the results of every job
+        together with its summary. When False only the summaries are computed
+        and the results are left as lazy plans.
+
+    Returns:
+        dict[str, Tuple[TableReconciliationData,
+        TableReconciliationSummarizationData]]: the reconciliation and the
+        summary of every job keyed by the job name.
+    """
+    jobs = list(jobs)
+    names = [job.name for job in jobs]
+
+    assert len(set(names)) == len(names), "job names must be unique"
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(_run_job, job, collect_results) for job in jobs
+        ]
+        outputs = [f.result() for f in futures]
+
+    return dict(zip(names, outputs))
+
+
+def _import_factory(path: str) -> Callable:
+    module, _, attribute = path.partition(":")
+    assert attribute, "factories are given as module:function, got %s" % path
+    return getattr(importlib.import_module(module), attribute)
+
+
+def _get_source(
+    spec: Union[str, Dict[str, Any]], root: pt.Path
+) -> Callable[[], pl.LazyFrame]:
+    if isinstance(spec, str):
+        spec = dict(path=spec)
+
+    if "factory" in spec:
+        return partial(
+            _import_factory(spec["factory"]), **spec.get("kwargs", {})
+        )
+
+    path = pt.Path(spec["path"])
+    if not path.is_absolute():
+        path = root / path
+
+    assert (
+        path.suffix in scanners
+    ), "cannot scan %s, supported file types are %s" % (
+        path,
+        ", ".join(scanners),
+    )
+
+    return partial(scanners[path.suffix], path, **spec.get("kwargs", {}))
+
+
+def load_jobs(path: Union[str, pt.Path]) -> List[ReconciliationJob]:
+    """Loads reconciliation jobs from a yaml job specification.
+
+    The specification holds a list of jobs and optional defaults shared by
+    every job. The left and right tables are either files, scanned according
+    to their suffix, or factories given as module:function which return a
+    LazyFrame. Relative paths are resolved from the specification directory.
+
+    .. code-block:: yaml
+
+        defaults:
+          method: is_close_numeric
+          kwargs:
+            a_tol: 0.01
+        jobs:
+          - name: marketfee
+            left: marketfee_left.parquet
+            right:
+              factory: reports.sources:marketfee
+              kwargs:
+                days: 1
+            column_indexes: [0, 1, 2]
+            kwargs:
+              pl1_name: infoserver
+              pl2_name: databricks
+
+    Args:
+        path (str | Path): the yaml file.
+
+    Returns:
+        list[ReconciliationJob]: the jobs in the order of the specification.
+    """
+    path = pt.Path(path)
+
+    with open(path) as f:
+        spec = yaml.safe_load(f)
+
+    defaults = spec.get("defaults", {})
+    jobs = []
+
+    for job in spec["jobs"]:
+        job = dict(defaults, **job)
+        job["kwargs"] = dict(
+            defaults.get("kwargs", {}), **job.get("kwargs", {})
+        )
+        job["left"] = _get_source(job["left"], path.parent)
+        job["right"] = _get_source(job["right"], path.parent)
+        jobs.append(ReconciliationJob(**job))
+
+    return jobs
@@ -1,12 +1,27 @@
+import os
 import yaml
 import json
+import weakref
+import tempfile
+import pathlib as pt
 from pprint import pformat
-from typing import List
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
 import polars as pl
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from .utils._set_case import SetCase
 from .utils._get_suffixed import GetSuffixed
 
+MethodOptions = Literal["is_equal", "is_close_numeric", "reconcile"]
+
 
 @dataclass
 class MethodData:
@@ -15,6 +30,98 @@ class MethodData:
     get_right: GetSuffixed
 
 
+@dataclass(frozen=True)
+class ColumnRoles:
+    """The roles of the columns of a reconciliation result.
+
+    Attributes:
+        is_left (str): the flag column of the rows found in the left table.
+
+        is_right (str): the flag column of the rows found in the right table.
+
+        is_both (str): the flag column of the rows found in both tables.
+
+        left (tuple[str]): the left suffixed columns, in result order.
+
+        right (tuple[str]): the right suffixed columns, in result order.
+
+        validation (tuple[str]): the validation columns, in result order.
+
+        tested (dict[str, tuple[str, str, str]]): the left, right and
+        validation columns of every tested column. The left and right columns
+        are None when the table names are not known.
+    """
+
+    is_left: str
+    is_right: str
+    is_both: str
+    left: Tuple[str, ...]
+    right: Tuple[str, ...]
+    validation: Tuple[str, ...]
+    tested: Dict[str, Tuple[str, str, str]] = field(hash=False)
+
+    @classmethod
+    def from_columns(
+        cls,
+        columns: List[str],
+        left: Optional[str] = None,
+        right: Optional[str] = None,
+    ) -> "ColumnRoles":
+        """Indexes the columns of a reconciliation result in a single pass.
+
+        Args:
+            columns (list[str]): the result column names.
+
+            left (str, optional): the left table name, the left suffixed
+            columns are not indexed when None.
+
+            right (str, optional): the right table name, the right suffixed
+            columns are not indexed when None.
+
+        Returns:
+            ColumnRoles: the column roles.
+        """
+        flags = {}
+        suffixed = {left: [], right: []}
+        validation = []
+        suffixes = {
+            " ~%s~" % name: name for name in [left, right] if name is not None
+        }
+
+        for c in columns:
+            lowered = c.lower()
+            if "~*validation*~" in lowered:
+                validation.append(c)
+                continue
+
+            for flag in ["**left**", "**right**", "**both**"]:
+                if flag in lowered:
+                    flags.setdefault(flag, c)
+
+            for suffix, name in suffixes.items():
+                if suffix in c:
+                    suffixed[name].append(c)
+
+        tested = {}
+        for v in validation:
+            prefix = v[: -len(" ~*validation*~")]
+            tested[prefix] = (
+                None if left is None else "%s ~%s~" % (prefix, left),
+                None if right is None else "%s ~%s~" % (prefix, right),
+                v,
+            )
+
+        return cls(
+            flags.get("**left**"),
+            flags.get("**right**"),
+            flags.get("**both**"),
+            tuple(suffixed[left]),
+            tuple(suffixed[right]),
+            tuple(validation),
+            tested,
+        )
+
+
 @dataclass
 class TableReconciliationData:
     results: pl.LazyFrame
@@ -24,52 +131,194 @@ class TableReconciliationData:
     columns_indexes: List[str]
     columns_ignored: List[str]
     columns_tested: List[str]
+    streaming: bool = False
+    sample_fraction: float = 1.0
+    unsorted_results: Optional[pl.LazyFrame] = None
+    roles: Optional[ColumnRoles] = None
+    preflight: Optional["PreflightData"] = field(default=None, compare=False)
+
+    _memoize: bool = field(
+        default=False, init=False, repr=False, compare=False
+    )
+    _memory_budget: Optional[int] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _plan: Optional[pl.LazyFrame] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _spill: Optional[weakref.finalize] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _memoize_after: int = field(
+        default=0, init=False, repr=False, compare=False
+    )
+    _uses: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # the column roles are resolved once, the accessors below never
+        # resolve the schema of the results again
+        if self.roles is None:
+            self.roles = ColumnRoles.from_columns(
+                self.results.collect_schema().names(), self.left, self.right
+            )
 
     @property
-    def is_left_col(self) -> List[str]:
-        return [c for c in self.results.columns if "**left**" in c.lower()][0]
+    def is_left_col(self) -> str:
+        return self.roles.is_left
 
     @property
-    def is_right_col(self) -> List[str]:
-        return [c for c in self.results.columns if "**right**" in c.lower()][0]
+    def is_right_col(self) -> str:
+        return self.roles.is_right
 
     @property
-    def is_intersection_col(self) -> List[str]:
-        return [c for c in self.results.columns if "**both**" in c.lower()][0]
+    def is_intersection_col(self) -> str:
+        return self.roles.is_both
 
     @property
     def validation_columns(self) -> List[str]:
-        return [
-            c for c in self.results.columns if "~*validation*~" in c.lower()
-        ]
+        return list(self.roles.validation)
 
     @property
     def left_columns(self) -> List[str]:
-        return [c for c in self.results.columns if " ~%s~" % self.left in c]
+        return list(self.roles.left)
 
     @property
     def right_columns(self) -> List[str]:
-        return [c for c in self.results.columns if " ~%s~" % self.right in c]
+        return list(self.roles.right)
+
+    def memoize(
+        self, memory_budget: Optional[int] = None, after: int = 0
+    ) -> "TableReconciliationData":
+        """Materializes the results the first time they are used, later
+        accessors and summaries reuse them instead of running the plan again.
+
+        Args:
+            memory_budget (int, optional): The number of bytes the results may
+            hold in memory. The results are streamed to a temporary ipc file,
+            they are read into memory when the file fits in the budget and
+            memory mapped otherwise.
+
+            after (int, optional): The number of uses which run the lazy plan
+            before the results are materialized. With after=1 results which
+            are used once never leave the lazy plan.
+
+        Returns:
+            TableReconciliationData: this reconciliation.
+        """
+        assert after >= 0, "after must be a non-negative integer"
+        self._memoize = True
+        self._memory_budget = memory_budget
+        self._memoize_after = after
+        return self
+
+    def release(self):
+        """Frees the memoized results, the next use materializes them again."""
+        self._uses = 0
+        if self._plan is not None:
+            self.results = self._plan
+            self._plan = None
+
+        if self._spill is not None:
+            self._spill()
+            self._spill = None
+
+    def _materialize(self):
+        engine = "streaming" if self.streaming else "auto"
+
+        if self._memory_budget is None:
+            return self.results.collect(engine=engine).lazy()
+
+        handle, path = tempfile.mkstemp(suffix=".arrow")
+        os.close(handle)
+        # the temporary file is removed on release or once this object is
+        # garbage collected
+        self._spill = weakref.finalize(self, os.remove, path)
+
+        # the results are streamed to disk first, so that results larger than
+        # the budget are never held in memory
+        self.results.sink_ipc(path, engine="streaming")
+
+        if os.path.getsize(path) > self._memory_budget:
+            return pl.scan_ipc(path, memory_map=True)
+
+        results = pl.read_ipc(path, memory_map=False).lazy()
+        self._spill()
+        self._spill = None
+        return results
 
     def get_results_union(self) -> pl.LazyFrame:
+        if self._memoize and self._plan is None:
+            self._uses += 1
+            if self._uses > self._memoize_after:
+                plan = self.results
+                self.results = self._materialize()
+                self._plan = plan
         return self.results
 
     def get_results_left(self) -> pl.LazyFrame:
-        return self.results.filter(pl.col(self.is_left_col))
+        return self.get_results_union().filter(pl.col(self.is_left_col))
 
     def get_results_right(self) -> pl.LazyFrame:
-        return self.results.filter(pl.col(self.is_right_col))
+        return self.get_results_union().filter(pl.col(self.is_right_col))
 
     def get_results_intersection(self) -> pl.LazyFrame:
-        return self.results.filter(pl.col(self.is_intersection_col))
+        return self.get_results_union().filter(
+            pl.col(self.is_intersection_col)
+        )
 
     def get_results_disjoint(self) -> pl.LazyFrame:
-        return self.results.filter(pl.col(self.is_intersection_col).is_not())
+        return self.get_results_union().filter(
+            pl.col(self.is_intersection_col).not_()
+        )
+
+    def get_failures(self, limit: Optional[int] = None) -> pl.LazyFrame:
+        """Selects the rows where at least one validation failed.
+
+        The failure predicate is applied to the results before the
+        show_failed_first and show_both_first sorts, and the worst rows are
+        picked with a top-k selection on the number of failed validations
+        rather than a full sort.
+
+        Args:
+            limit (int, optional): the number of rows with the most failed
+            validations to return. Every failed row is returned, in no
+            particular order, when None.
+
+        Returns:
+            pl.LazyFrame: the failed rows.
+        """
+        if self._memoize:
+            results = self.get_results_union()
+        elif self.unsorted_results is not None:
+            results = self.unsorted_results
+        else:
+            results = self.results
+
+        # a missing validation is a failed one, as in the summaries
+        passed = [
+            pl.col(c).fill_null(pl.lit(False)) for c in self.validation_columns
+        ]
+        if len(passed) == 0:
+            return results.filter(pl.lit(False))
+
+        failures = results.filter(pl.all_horizontal(passed).not_())
+
+        if limit is None:
+            return failures
+
+        assert limit >= 0, "limit must be a non-negative integer"
+
+        n_failed = pl.sum_horizontal(
+            [c.not_().cast(pl.UInt32) for c in passed]
+        )
+
+        return failures.top_k(limit, by=n_failed)
 
     def get_rows_left_only(self) -> pl.LazyFrame:
         return (
-            self.results.filter(
-                pl.col(self.is_left_col) & pl.col(self.is_right_col).is_not()
+            self.get_results_union()
+            .filter(
+                pl.col(self.is_left_col) & pl.col(self.is_right_col).not_()
             )
             .select(self.columns_indexes + self.left_columns)
             .rename(
@@ -88,8 +337,9 @@ class TableReconciliationData:
 
     def get_rows_right_only(self) -> pl.LazyFrame:
         return (
-            self.results.filter(
-                pl.col(self.is_right_col) & pl.col(self.is_left_col).is_not()
+            self.get_results_union()
+            .filter(
+                pl.col(self.is_right_col) & pl.col(self.is_left_col).not_()
             )
             .select(self.columns_indexes + self.right_columns)
             .rename(
@@ -106,6 +356,154 @@ class TableReconciliationData:
             )
         )
 
+    def _metadata(self) -> Dict[str, Any]:
+        return dict(
+            left=self.left,
+            right=self.right,
+            columns_all=self.columns_all,
+            columns_indexes=self.columns_indexes,
+            columns_ignored=self.columns_ignored,
+            columns_tested=self.columns_tested,
+            streaming=self.streaming,
+            sample_fraction=self.sample_fraction,
+        )
+
+    def sink(
+        self,
+        path: Union[str, pt.Path],
+        file_format: Optional[Literal["parquet", "ipc"]] = None,
+        join: Optional[Literal["left", "right", "inner", "outer"]] = "outer",
+        memory_budget: Optional[int] = None,
+    ) -> Optional["TableReconciliationSummarizationData"]:
+        """Writes the results to disk with the polars streaming engine.
+
+        The column roles are stored with the results, in the parquet file
+        metadata or in a json file next to an ipc file, so the written
+        results can be read back with load.
+
+        Args:
+            path (str | Path): The file to write the results to.
+
+            file_format (str, optional): Either parquet or ipc, inferred from
+            the file suffix when not given.
+
+            join (str, optional): The summary join method, the summary is
+            computed on the same streaming pass as the write. No summary is
+            computed when None.
+
+            memory_budget (int, optional): The approximate number of bytes the
+            streaming pass is allowed to hold, used to size the streaming
+            chunks.
+
+        Returns:
+            TableReconciliationSummarizationData | None: the summary of the
+            sunk results.
+        """
+        from .tables._summarizer import _moments_query, _summary_from_moments
+        from .utils.functions import get_streaming_chunk_size
+
+        path = pt.Path(path)
+        file_format = _get_file_format(path, file_format)
+        metadata = json.dumps(self._metadata())
+
+        if file_format == "parquet":
+            queries = [
+                self.results.sink_parquet(
+                    path, metadata={_metadata_key: metadata}, lazy=True
+                )
+            ]
+        else:
+            queries = [self.results.sink_ipc(path, lazy=True)]
+            _get_sidecar(path).write_text(metadata)
+
+        if join is not None:
+            queries.append(_moments_query(self.results, roles=self.roles))
+
+        chunk_size = None
+        if memory_budget is not None:
+            chunk_size = get_streaming_chunk_size(
+                self.results.collect_schema(), memory_budget
+            )
+
+        with pl.Config(streaming_chunk_size=chunk_size):
+            collected = pl.collect_all(queries, engine="streaming")
+
+        if join is not None:
+            return _summary_from_moments(
+                collected[-1], join, self.sample_fraction
+            )
+
+        return None
+
+    def save(
+        self,
+        path: Union[str, pt.Path],
+        file_format: Optional[Literal["parquet", "ipc"]] = None,
+    ):
+        """Writes the results and their column roles to disk.
+
+        Args:
+            path (str | Path): The file to write the results to.
+
+            file_format (str, optional): Either parquet or ipc, inferred from
+            the file suffix when not given.
+        """
+        self.sink(path, file_format, join=None)
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, pt.Path],
+        file_format: Optional[Literal["parquet", "ipc"]] = None,
+    ) -> "TableReconciliationData":
+        """Lazily reads results written by save or sink. Ipc files are
+        memory mapped, their columns are not copied into memory until a query
+        needs them.
+
+        Args:
+            path (str | Path): The file the results were written to.
+
+            file_format (str, optional): Either parquet or ipc, inferred from
+            the file suffix when not given.
+
+        Returns:
+            TableReconciliationData: the reconciliation over the stored
+            results.
+        """
+        path = pt.Path(path)
+        file_format = _get_file_format(path, file_format)
+
+        if file_format == "parquet":
+            metadata = pl.read_parquet_metadata(path)[_metadata_key]
+            results = pl.scan_parquet(path)
+        else:
+            metadata = _get_sidecar(path).read_text()
+            results = pl.scan_ipc(path, memory_map=True)
+
+        return cls(results, **json.loads(metadata))
+
+
+_metadata_key = "datarec"
+
+
+def _get_file_format(
+    path: pt.Path, file_format: Optional[Literal["parquet", "ipc"]]
+) -> Literal["parquet", "ipc"]:
+    if file_format is None:
+        file_format = "parquet" if path.suffix == ".parquet" else "ipc"
+
+    assert file_format in [
+        "parquet",
+        "ipc",
+    ], "file_format is either parquet or ipc"
+
+    return file_format
+
+
+def _get_sidecar(path: pt.Path) -> pt.Path:
+    # polars does not write custom metadata to ipc files
+    return path.with_name(path.name + ".json")
+
 
 @dataclass
 class TableReconciliationSummarizationData:
@@ -133,6 +531,14 @@ class TableReconciliationSummarizationData:
 
     pass_ratio: float = 1
 
+    column_breakdown: Optional[pl.DataFrame] = field(
+        default=None, compare=False
+    )
+
+    sample_fraction: float = 1.0
+    confidence_level: Optional[float] = None
+    confidence_intervals: Optional[Dict[str, Tuple[float, float]]] = None
+
     @property
     def PASS(self):
         if self.n_tested_entries > 0:
@@ -149,7 +555,7 @@ class TableReconciliationSummarizationData:
         return "FAILED"
 
     def to_dict(self):
-        return dict(
+        summary = dict(
             TestedMeta=dict(
                 flag=self.flag,
                 passed=self.PASS,
@@ -183,7 +589,104 @@ class TableReconciliationSummarizationData:
             ),
         )
 
+        if self.column_breakdown is not None:
+            summary["Columns"] = {
+                row.pop("column"): row
+                for row in self.column_breakdown.iter_rows(named=True)
+            }
+
+        if self.sample_fraction < 1:
+            summary["Sampling"] = dict(
+                sample_fraction=self.sample_fraction,
+                confidence_level=self.confidence_level,
+                confidence_intervals=self.confidence_intervals,
+            )
+
+        return summary
+
     def get_string(self, sort_dicts=False, width=25, compact=True):
         return pformat(
             self.to_dict(), sort_dicts=sort_dicts, width=width, compact=compact
         )
+
+
+@dataclass
+class PreflightData:
+    """The outcome of the preflight checks.
+
+    - pass: the tables hold the same rows, the row join can be skipped.
+    - fail: the row counts differ, or a column has incompatible types.
+    - unknown: only the row join can tell whether the tables reconcile,
+      columns_differing narrows down where to look. Numeric columns of
+      different types are listed in columns_mismatched but do not fail.
+    """
+
+    verdict: Literal["pass", "fail", "unknown"]
+    n_rows_left: int
+    n_rows_right: int
+    columns_mismatched: List[str]
+    columns_differing: List[str]
+    profile: pl.DataFrame = field(compare=False)
+
+
+@dataclass
+class IncrementalReconciliationData:
+    results: Optional[TableReconciliationData]
+    summary: TableReconciliationSummarizationData
+    partitions_changed: List[List[Any]]
+    partitions_reused: List[List[Any]]
+
+
+@dataclass
+class MerkleReconciliationData:
+    results: Optional[TableReconciliationData]
+    depth: int
+    ranges_mismatched: List[int]
+    n_rows_matched_left: int
+    n_rows_matched_right: int
+
+
+@dataclass
+class DrillDownReconciliationData:
+    results: Optional[TableReconciliationData]
+    levels: List[TableReconciliationData]
+    groups_mismatched: List[pl.DataFrame]
+
+
+@dataclass
+class DigestReconciliationData:
+    results: Optional[TableReconciliationData]
+    n_buckets: int
+    buckets_mismatched: List[int]
+    n_rows_matched_left: int
+    n_rows_matched_right: int
+
+
+@dataclass(frozen=True)
+class SqlDialect:
+    """The SQL templates of a database, every template is filled with
+    str.format.
+
+    - hash: a text expression hashed to a non negative integer below 2**32,
+      the first 32 bits of its md5 digest, so that databases of different
+      dialects hash the same text to the same value.
+    - text: a column cast to text.
+    - modulo: the remainder of the division of two integers.
+    - quote: a quoted column name.
+    """
+
+    hash: str
+    text: str = "CAST({} AS TEXT)"
+    modulo: str = "({} % {})"
+    quote: str = '"{}"'
+
+
+@dataclass
+class ReconciliationJob:
+    name: str
+    left: Callable[[], pl.LazyFrame]
+    right: Callable[[], pl.LazyFrame]
+    method: MethodOptions = "is_equal"
+    column_indexes: Optional[List[int]] = None
+    join: Literal["left", "right", "inner", "outer"] = "outer"
+    kwargs: Dict[str, Any] = field(default_factory=dict)
@@ -0,0 +1,296 @@
+import sqlite3
+import hashlib
+from typing import Callable, Iterable, List, Optional
+
+import polars as pl
+
+from .data import DigestReconciliationData, MethodOptions, SqlDialect
+from .utils.functions import convert_iterable_to_list
+from .tables._partitioned import method_map, _check_method
+
+dialects = {
+    "sqlite": SqlDialect(hash="datarec_md5({})"),
+    "postgres": SqlDialect(
+        hash="(('x' || substr(md5({}), 1, 8))::bit(32)::bigint)"
+    ),
+    "databricks": SqlDialect(
+        hash="CAST(conv(substr(md5({}), 1, 8), 16, 10) AS BIGINT)",
+        text="CAST({} AS STRING)",
+        quote="`{}`",
+    ),
+    "oracle": SqlDialect(
+        hash=(
+            "TO_NUMBER(SUBSTR(RAWTOHEX(STANDARD_HASH({}, 'MD5')), 1, 8), "
+            "'XXXXXXXX')"
+        ),
+        text="TO_CHAR({})",
+        modulo="MOD({}, {})",
+    ),
+}
+
+# the separator of the columns and the text of a missing value in the text
+# form of a row
+_separator = "'|'"
+_null = "'~null~'"
+
+# oracle accepts at most 1000 values in a single in list
+_max_in_list = 1000
+
+
+def _get_dialect(dialect: str) -> SqlDialect:
+    assert dialect in dialects, "dialect is either %s" % ", ".join(dialects)
+    return dialects[dialect]
+
+
+def _text(columns: List[str], dialect: SqlDialect) -> str:
+    return (" || %s || " % _separator).join(
+        "COALESCE(%s, %s)"
+        % (dialect.text.format(dialect.quote.format(c)), _null)
+        for c in columns
+    )
+
+
+def _bucket(
+    key_columns: List[str], n_buckets: int, dialect: SqlDialect
+) -> str:
+    return dialect.modulo.format(
+        dialect.hash.format(_text(key_columns, dialect)), n_buckets
+    )
+
+
+def columns_sql(query: str) -> str:
+    """The query without rows, used to read the columns of a query."""
+    return "SELECT * FROM (\n%s\n) q WHERE 1 = 0" % query
+
+
+def digest_sql(
+    query: str,
+    columns: List[str],
+    key_columns: List[str],
+    n_buckets: int = 1024,
+    dialect: str = "sqlite",
+) -> str:
+    """Generates the SQL of the bucket digests of a query.
+
+    The rows are split into buckets by the hash of their key columns, every
+    bucket holds its row count and the sum of the hashes of its rows. The
+    hashes are computed from the text form of the columns, so both queries
+    must format their values the same way, casting them in the queries when
+    the databases do not.
+
+    Args:
+        query (str): the query of the table.
+
+        columns (list[str]): the columns of the query hashed into the rows.
+
+        key_columns (list[str]): the columns of the query hashed into the
+        buckets.
+
+        n_buckets (int, optional): the number of buckets.
+
+        dialect (str, optional): sqlite, postgres, databricks or oracle.
+
+    Returns:
+        str: a query of the bucket, n_rows and digest of every non empty
+        bucket.
+    """
+    d = _get_dialect(dialect)
+    return (
+        "SELECT bucket, COUNT(*) AS n_rows, SUM(row_hash) AS digest FROM (\n"
+        "SELECT %s AS bucket, %s AS row_hash FROM (\n%s\n) q\n"
+        ") d GROUP BY bucket"
+        % (
+            _bucket(key_columns, n_buckets, d),
+            d.hash.format(_text(columns, d)),
+            query,
+        )
+    )
+
+
+def rows_sql(
+    query: str,
+    key_columns: List[str],
+    buckets: Iterable[int],
+    n_buckets: int = 1024,
+    dialect: str = "sqlite",
+) -> str:
+    """Generates the SQL of the rows of a query within the given buckets.
+
+    Args:
+        query (str): the query of the table.
+
+        key_columns (list[str]): the columns of the query hashed into the
+        buckets.
+
+        buckets (Iterable[int]): the buckets to select.
+
+        n_buckets (int, optional): the number of buckets of the digests.
+
+        dialect (str, optional): sqlite, postgres, databricks or oracle.
+
+    Returns:
+        str: the query of the rows.
+    """
+    d = _get_dialect(dialect)
+    buckets = sorted(convert_iterable_to_list(buckets))
+    bucket = _bucket(key_columns, n_buckets, d)
+    chunks = [
+        buckets[i : i + _max_in_list]
+        for i in range(0, len(buckets), _max_in_list)
+    ]
+    condition = " OR ".join(
+        "%s IN (%s)" % (bucket, ", ".join(str(b) for b in chunk))
+        for chunk in chunks
+    )
+    return "SELECT * FROM (\n%s\n) q WHERE %s" % (query, condition or "1 = 0")
+
+
+def _md5(text: Optional[str]) -> Optional[int]:
+    if text is None:
+        return None
+    return int(hashlib.md5(text.encode()).hexdigest()[:8], 16)
+
+
+def sqlite_fetch(
+    connection: sqlite3.Connection,
+) -> Callable[[str], pl.DataFrame]:
+    """The fetch function of the reference sqlite backend, the md5 hash of
+    the sqlite dialect is registered on the connection.
+
+    Args:
+        connection (sqlite3.Connection): the database connection.
+
+    Returns:
+        Callable[[str], pl.DataFrame]: runs a query and returns its rows.
+    """
+    connection.create_function("datarec_md5", 1, _md5, deterministic=True)
+
+    def fetch(sql: str) -> pl.DataFrame:
+        return pl.read_database(sql, connection)
+
+    return fetch
+
+
+def _read_digests(digests: pl.DataFrame) -> pl.DataFrame:
+    # databases return the aliases in their own case and their own numeric
+    # types
+    digests = digests.rename({c: c.lower() for c in digests.columns})
+    return digests.select(
+        pl.col("bucket").cast(pl.Int64),
+        pl.col("n_rows").cast(pl.Int64),
+        pl.col("digest").cast(pl.Int64),
+    )
+
+
+def _cast_empty(rows: pl.DataFrame, other: pl.DataFrame) -> pl.DataFrame:
+    # an empty result has no values to infer the column types from
+    if len(rows) > 0:
+        return rows
+    return rows.cast(dict(zip(rows.columns, other.schema.dtypes())))
+
+
+def reconcile_sql(
+    query_1: str,
+    query_2: str,
+    fetch_1: Callable[[str], pl.DataFrame],
+    fetch_2: Callable[[str], pl.DataFrame],
+    column_indexes: Iterable[int],
+    dialect_1: str = "sqlite",
+    dialect_2: Optional[str] = None,
+    n_buckets: int = 1024,
+    method: MethodOptions = "is_equal",
+    **kwargs,
+) -> DigestReconciliationData:
+    """Reconciles two database queries by comparing bucket digests computed
+    in the databases, and fetching only the rows of the mismatched buckets.
+
+    Args:
+        query_1 (str): the query of the left table.
+
+        query_2 (str): the query of the right table.
+
+        fetch_1 (Callable[[str], pl.DataFrame]): runs SQL on the database of
+        the left query, for example sqlite_fetch(connection) or
+        partial(pl.read_database, connection=connection).
+
+        fetch_2 (Callable[[str], pl.DataFrame]): runs SQL on the database of
+        the right query.
+
+        column_indexes (Iterable[int]): the index columns.
+
+        dialect_1 (str, optional): the dialect of the left database.
+
+        dialect_2 (str, optional): the dialect of the right database, the
+        dialect of the left database when not given.
+
+        n_buckets (int, optional): the number of buckets.
+
+        method (str, optional): is_equal, is_close_numeric or reconcile. The
+        mismatched buckets are reconciled with it.
+
+        **kwargs: forwarded to the reconciliation method.
+
+    Returns:
+        DigestReconciliationData: the reconciliation of the mismatched
+        buckets.
+    """
+    _check_method(method)
+    assert n_buckets > 0, "n_buckets must be positive"
+
+    if dialect_2 is None:
+        dialect_2 = dialect_1
+
+    column_indexes = convert_iterable_to_list(column_indexes)
+
+    # the fetches run one after another, database connections such as the
+    # sqlite ones can only be used from the thread which opened them
+    columns_1 = fetch_1(columns_sql(query_1)).columns
+    columns_2 = fetch_2(columns_sql(query_2)).columns
+
+    # the columns of the right query are matched to the left ones by name,
+    # ignoring case, like the reconciler does
+    names_2 = {c.lower(): c for c in columns_2}
+    columns_1 = [c for c in columns_1 if c.lower() in names_2]
+    columns_2 = [names_2[c.lower()] for c in columns_1]
+    keys_1 = [columns_1[i] for i in column_indexes]
+    keys_2 = [columns_2[i] for i in column_indexes]
+
+    digests_1 = _read_digests(
+        fetch_1(digest_sql(query_1, columns_1, keys_1, n_buckets, dialect_1))
+    )
+    digests_2 = _read_digests(
+        fetch_2(digest_sql(query_2, columns_2, keys_2, n_buckets, dialect_2))
+    )
+
+    compared = digests_1.join(
+        digests_2, on="bucket", how="full", coalesce=True, suffix="_2"
+    )
+    differs = pl.col("n_rows").ne_missing(pl.col("n_rows_2")) | pl.col(
+        "digest"
+    ).ne_missing(pl.col("digest_2"))
+    mismatched = sorted(compared.filter(differs)["bucket"].to_list())
+    matched = compared.filter(differs.not_())
+
+    results = None
+
+    if len(mismatched) > 0:
+        rows_1 = fetch_1(
+            rows_sql(query_1, keys_1, mismatched, n_buckets, dialect_1)
+        )
+        rows_2 = fetch_2(
+            rows_sql(query_2, keys_2, mismatched, n_buckets, dialect_2)
+        )
+        results = method_map[method](
+            _cast_empty(rows_1, rows_2).lazy(),
+            _cast_empty(rows_2, rows_1).lazy(),
+            column_indexes=column_indexes,
+            **kwargs,
+        )
+
+    return DigestReconciliationData(
+        results,
+        n_buckets,
+        mismatched,
+        int(matched["n_rows"].sum()),
+        int(matched["n_rows_2"].sum()),
+    )
@@ -1,5 +1,40 @@
-from ._is_equal import is_equal
-from ._is_close_numeric import is_close_numeric
-from ._summarizer import summarize_reconciliation
+from ._is_equal import is_equal, is_equal_async
+from ._is_close_numeric import is_close_numeric, is_close_numeric_async
+from ._reconcile import reconcile, reconcile_async
+from ._summarizer import (
+    summarize_reconciliation,
+    summarize_reconciliation_async,
+    summarize_all,
+)
+from ._partitioned import reconcile_partitioned
+from ._incremental import reconcile_incremental
+from ._cache import reconcile_cached
+from ._drilldown import reconcile_drilldown
+from ._difference_statistics import difference_statistics
+from ._preflight import preflight
+from ._merkle import (
+    range_digests,
+    compare_range_digests,
+    reconcile_merkle,
+)
 
-__all__ = ["is_equal", "is_close_numeric", "summarize_reconciliation"]
+__all__ = [
+    "is_equal",
+    "is_equal_async",
+    "is_close_numeric",
+    "is_close_numeric_async",
+    "reconcile",
+    "reconcile_async",
+    "summarize_reconciliation",
+    "summarize_reconciliation_async",
+    "summarize_all",
+    "reconcile_partitioned",
+    "reconcile_incremental",
+    "range_digests",
+    "compare_range_digests",
+    "reconcile_merkle",
+    "reconcile_cached",
+    "reconcile_drilldown",
+    "difference_statistics",
+    "preflight",
+]
@@ -0,0 +1,237 @@
+import os
+import json
+import inspect
+import hashlib
+import pathlib as pt
+from typing import Literal, Optional, Tuple, Union
+
+import polars as pl
+
+from ..data import (
+    MethodOptions,
+    TableReconciliationData,
+    TableReconciliationSummarizationData,
+)
+from ..utils.functions import (
+    convert_iterable_to_list,
+    get_lazyframe_column_names,
+)
+from ._partitioned import method_map, _check_method
+from ._preflight import _row_hash
+from ._summarizer import _moments_frame, _moments_query, _summary_from_moments
+
+FingerprintOptions = Literal["plan", "data"]
+
+# the entries carry their own suffix so that the eviction never touches other
+# files of the cache directory
+_results_suffix = ".datarec.arrow"
+_metadata_suffix = ".datarec.json"
+
+
+def _input_fingerprint(
+    lf: pl.LazyFrame, fingerprint: FingerprintOptions, ordered: bool
+) -> str:
+    """Fingerprints a table either by its serialized query plan or by its
+    schema, row count and the wrapping sum of its row hashes. The row numbers
+    are hashed with the rows when they are matched by position, so that
+    reordered rows change the fingerprint."""
+    if fingerprint == "plan":
+        return hashlib.sha256(lf.serialize()).hexdigest()
+
+    columns = get_lazyframe_column_names(lf)
+    n_rows, digest = (
+        lf.select(pl.len(), _row_hash(columns, ordered).sum()).collect().row(0)
+    )
+    return hashlib.sha256(
+        json.dumps(
+            [str(lf.collect_schema()), n_rows, digest], default=str
+        ).encode()
+    ).hexdigest()
+
+
+def _cache_key(
+    p1: pl.LazyFrame,
+    p2: pl.LazyFrame,
+    method: str,
+    fingerprint: FingerprintOptions,
+    kwargs: dict,
+) -> str:
+    # the defaults are bound so that omitting an argument and passing its
+    # default value share the same key
+    parameters = inspect.signature(method_map[method]).bind(p1, p2, **kwargs)
+    parameters.apply_defaults()
+    arguments = {
+        name: (
+            convert_iterable_to_list(value)
+            if isinstance(value, range)
+            else value
+        )
+        for name, value in parameters.arguments.items()
+        if name not in ["p1", "p2"]
+    }
+    # without an index the rows are reconciled by position
+    ordered = not arguments["column_indexes"]
+    return hashlib.sha256(
+        json.dumps(
+            dict(
+                method=method,
+                arguments=arguments,
+                left=_input_fingerprint(p1, fingerprint, ordered),
+                right=_input_fingerprint(p2, fingerprint, ordered),
+            ),
+            sort_keys=True,
+            default=str,
+        ).encode()
+    ).hexdigest()
+
+
+def _evict(cache_dir: pt.Path, max_bytes: int):
+    """Removes the least recently used entries until the cache fits in
+    max_bytes, an entry is used whenever it is written or read."""
+    entries = []
+    for metadata in cache_dir.glob("*" + _metadata_suffix):
+        results = metadata.with_suffix(".arrow")
+        size = metadata.stat().st_size
+        if results.exists():
+            size += results.stat().st_size
+        entries.append((metadata.stat().st_mtime, size, metadata, results))
+
+    total = sum(e[1] for e in entries)
+
+    for _, size, metadata, results in sorted(entries, key=lambda e: e[0]):
+        if total <= max_bytes:
+            break
+        results.unlink(missing_ok=True)
+        metadata.unlink(missing_ok=True)
+        total -= size
+
+
+def _write_entry(
+    cache_dir: pt.Path,
+    key: str,
+    results: pl.DataFrame,
+    moments: pl.DataFrame,
+    reconciliation: TableReconciliationData,
+):
+    results_path = cache_dir / (key + _results_suffix)
+    metadata_path = cache_dir / (key + _metadata_suffix)
+
+    # entries are written to temporary files first, a reader never sees a
+    # partially written entry
+    results.write_ipc(results_path.with_suffix(".arrow.tmp"))
+    metadata_path.with_suffix(".json.tmp").write_text(
+        json.dumps(
+            dict(reconciliation._metadata(), moments=moments.to_dicts())
+        )
+    )
+    os.replace(results_path.with_suffix(".arrow.tmp"), results_path)
+    os.replace(metadata_path.with_suffix(".json.tmp"), metadata_path)
+
+
+def _read_entry(
+    cache_dir: pt.Path, key: str
+) -> Optional[Tuple[TableReconciliationData, pl.DataFrame]]:
+    results_path = cache_dir / (key + _results_suffix)
+    metadata_path = cache_dir / (key + _metadata_suffix)
+
+    if not (results_path.exists() and metadata_path.exists()):
+        return None
+
+    metadata = json.loads(metadata_path.read_text())
+    moments = _moments_frame(metadata.pop("moments"))
+
+    # reading refreshes the entry for the least recently used eviction
+    os.utime(metadata_path)
+
+    results = pl.scan_ipc(results_path, memory_map=True)
+
+    return TableReconciliationData(results, **metadata), moments
+
+
+def reconcile_cached(
+    p1: pl.LazyFrame,
+    p2: pl.LazyFrame,
+    cache_dir: Union[str, pt.Path],
+    method: MethodOptions = "is_equal",
+    join: Literal["left", "right", "inner", "outer"] = "outer",
+    fingerprint: FingerprintOptions = "data",
+    max_bytes: Optional[int] = 2 * 1024**3,
+    **kwargs,
+) -> Tuple[TableReconciliationData, TableReconciliationSummarizationData]:
+    """Reconciles two tables through an on-disk cache of materialized
+    results.
+
+    The cache key covers the reconciliation method, every argument of the
+    method, defaults included, and a fingerprint of both tables. On a hit the
+    join and the validation are skipped and the stored Arrow IPC results are
+    memory mapped. On a miss the results and the summary moments are collected
+    in a single pass and stored.
+
+    Args:
+        p1 (pl.LazyFrame): the left table.
+
+        p2 (pl.LazyFrame): the right table.
+
+        cache_dir (str | Path): the cache directory.
+
+        method (str, optional): is_equal, is_close_numeric or reconcile.
+
+        join (str, optional): the summary join method.
+
+        fingerprint (str, optional): "data" fingerprints the schema, row count
+        and row hashes of the tables at the cost of a scan of each. "plan"
+        fingerprints the serialized query plans of the tables instead, which
+        avoids the scans but does not see changes of the files or databases
+        they read, and serializes the data of in-memory tables.
+
+        max_bytes (int, optional): the size of the cache, the least recently
+        used entries are evicted once it is exceeded. The cache is unbounded
+        when None.
+
+        **kwargs: forwarded to the reconciliation method.
+
+    Returns:
+        Tuple[TableReconciliationData, TableReconciliationSummarizationData]:
+        the reconciliation and its summary.
+    """
+    _check_method(method)
+    assert fingerprint in [
+        "plan",
+        "data",
+    ], "fingerprint is either plan or data"
+
+    cache_dir = pt.Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    key = _cache_key(p1, p2, method, fingerprint, kwargs)
+
+    entry = _read_entry(cache_dir, key)
+
+    if entry is None:
+        reconciliation = method_map[method](p1, p2, **kwargs)
+        results, moments = pl.collect_all(
+            [
+                reconciliation.results,
+                _moments_query(
+                    reconciliation.results, roles=reconciliation.roles
+                ),
+            ]
+        )
+        _write_entry(cache_dir, key, results, moments, reconciliation)
+
+        if max_bytes is not None:
+            _evict(cache_dir, max_bytes)
+
+        entry = _read_entry(cache_dir, key)
+
+        if entry is None:
+            # the entry alone is larger than the cache
+            reconciliation.results = results.lazy()
+            reconciliation.unsorted_results = None
+            entry = reconciliation, moments
+
+    reconciliation, moments = entry
+
+    return reconciliation, _summary_from_moments(
+        moments, join, reconciliation.sample_fraction
+    )
@@ -0,0 +1,109 @@
+from typing import List, Optional
+
+import polars as pl
+
+from ..data import TableReconciliationData
+
+relative_difference_bins = [1e-9, 1e-6, 1e-4, 1e-3, 1e-2, 1e-1, 1.0]
+
+
+def difference_statistics(
+    reconciliation: TableReconciliationData,
+    bins: Optional[List[float]] = None,
+) -> pl.DataFrame:
+    """Computes the magnitude of the differences of every numeric tested
+    column in a single aggregation over the results.
+
+    The relative difference is the one is_close_numeric tests against r_tol,
+    the absolute difference divided by the mean of the left and right values.
+    The statistics show which a_tol and r_tol would pass the columns without
+    reconciling again.
+
+    Args:
+        reconciliation (TableReconciliationData): the reconciliation to
+        describe.
+
+        bins (list[float], optional): the increasing edges of the relative
+        difference histogram. The histogram holds one more count than there
+        are edges, values below the first edge are counted first and values
+        above the last edge are counted last.
+
+    Returns:
+        pl.DataFrame: one row per numeric tested column with the number of
+        compared entries, the maximum and mean absolute difference, the
+        maximum relative difference and the relative difference histogram.
+    """
+    if bins is None:
+        bins = relative_difference_bins
+
+    assert all(
+        lo < hi for lo, hi in zip(bins, bins[1:])
+    ), "bins must be increasing"
+
+    results = reconciliation.get_results_union()
+    schema = results.collect_schema()
+
+    columns = []
+    aggregations = []
+
+    for column, (left, right, _) in reconciliation.roles.tested.items():
+        if not (schema[left].is_numeric() and schema[right].is_numeric()):
+            continue
+
+        i = len(columns)
+        columns.append(column)
+
+        left = pl.col(left).cast(pl.Float64)
+        right = pl.col(right).cast(pl.Float64)
+        difference = left - right
+        absolute = difference.abs()
+        relative = (difference / ((left + right) / 2 + 1e-20)).abs()
+
+        bin_index = pl.sum_horizontal(
+            [(relative >= edge).cast(pl.UInt32) for edge in bins]
+        )
+
+        aggregations.extend(
+            [
+                (left.is_not_null() & right.is_not_null())
+                .sum()
+                .alias("%d n_compared" % i),
+                absolute.max().alias("%d max_abs_diff" % i),
+                absolute.mean().alias("%d mean_abs_diff" % i),
+                relative.max().alias("%d max_rel_diff" % i),
+                pl.concat_list(
+                    [
+                        ((bin_index == k) & relative.is_not_null()).sum()
+                        for k in range(len(bins) + 1)
+                    ]
+                ).alias("%d rel_diff_histogram" % i),
+            ]
+        )
+
+    statistics = dict(
+        column=pl.String,
+        n_compared=pl.UInt32,
+        max_abs_diff=pl.Float64,
+        mean_abs_diff=pl.Float64,
+        max_rel_diff=pl.Float64,
+        rel_diff_histogram=pl.List(pl.UInt32),
+    )
+
+    if len(columns) == 0:
+        return pl.DataFrame(schema=statistics)
+
+    aggregated = results.select(aggregations).collect().row(0, named=True)
+
+    return pl.DataFrame(
+        [
+            dict(
+                column=column,
+                **{
+                    name: aggregated["%d %s" % (i, name)]
+                    for name in list(statistics)[1:]
+                },
+            )
+            for i, column in enumerate(columns)
+        ],
+        schema=statistics,
+    )
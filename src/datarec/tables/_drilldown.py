@@ -0,0 +1,192 @@
+from typing import Iterable, List, Optional
+
+import polars as pl
+
+from ..data import (
+    DrillDownReconciliationData,
+    MethodOptions,
+    TableReconciliationData,
+)
+from ..utils.functions import convert_iterable_to_list, hash_columns
+from ._incremental import _get_ordered_columns
+from ._partitioned import method_map, _check_method, _get_key_columns
+from ._reconcile import reconcile
+
+
+def _aggregate(
+    lf: pl.LazyFrame,
+    keys: List[str],
+    numeric: List[str],
+    digested: List[str],
+) -> pl.LazyFrame:
+    """The row count and the sums and null counts of the numeric columns of
+    every group, the remaining columns are folded into the wrapping sum of
+    their row hashes. Sums skip missing values, the null counts tell a missing
+    value from a zero."""
+    aggregations = [pl.len().cast(pl.Int64).alias("~n_rows~")]
+    aggregations.extend(pl.col(c).sum() for c in numeric)
+    aggregations.extend(
+        pl.col(c).null_count().cast(pl.Int64).alias("~null_count~ %s" % c)
+        for c in numeric
+    )
+    if len(digested) > 0:
+        aggregations.append(hash_columns(digested).sum().alias("~digest~"))
+    return lf.group_by(keys).agg(aggregations)
+
+
+def _mismatched_groups(
+    reconciliation: TableReconciliationData, keys: List[str]
+) -> pl.DataFrame:
+    roles = reconciliation.roles
+    passed = pl.all_horizontal(
+        [pl.col(c) for c in roles.validation] + [pl.col(roles.is_both)]
+    ).fill_null(pl.lit(False))
+    return reconciliation.results.filter(passed.not_()).select(keys).collect()
+
+
+def _keep_groups(
+    lf: pl.LazyFrame, groups: pl.DataFrame, keys: List[str]
+) -> pl.LazyFrame:
+    groups = groups.lazy().rename(dict(zip(groups.columns, keys)))
+    return lf.join(groups, on=keys, how="semi", nulls_equal=True)
+
+
+def reconcile_drilldown(
+    p1: pl.LazyFrame,
+    p2: pl.LazyFrame,
+    column_indexes: Iterable[int],
+    levels: Optional[Iterable[int]] = None,
+    method: MethodOptions = "is_close_numeric",
+    a_tol: float = 10e-3,
+    r_tol: float = 10e-4,
+    digest_numeric: bool = False,
+    **kwargs,
+) -> DrillDownReconciliationData:
+    """Reconciles group aggregates on coarse prefixes of the index first and
+    only expands the groups which mismatch.
+
+    At every level both tables are grouped by a prefix of the index columns
+    and the row counts and the sums and null counts of the numeric columns are
+    reconciled. The floating point sums are compared within a_tol alone, a
+    relative tolerance would hide a row difference inside a large sum, so a
+    group only passes when no row of it can fail. The other columns
+    are compared through a digest of their row hashes. The groups which
+    mismatch are the only ones reconciled at the next level, and finally row
+    by row, so the work follows the number of differences rather than the
+    size of the tables.
+
+    Args:
+        p1 (pl.LazyFrame): the left table.
+
+        p2 (pl.LazyFrame): the right table.
+
+        column_indexes (Iterable[int]): the index columns, coarsest first.
+
+        levels (Iterable[int], optional): the number of leading index columns
+        grouped by at every level, for example [1, 2]. Defaults to every
+        proper prefix of the index.
+
+        method (str, optional): the row level method, is_equal,
+        is_close_numeric or reconcile.
+
+        a_tol (float, optional): the absolute tolerance of the aggregates,
+        also used by the row level method unless it is is_equal.
+
+        r_tol (float, optional): the relative tolerance of the row level
+        method unless it is is_equal, the aggregates are compared without
+        it.
+
+        digest_numeric (bool, optional): differences of opposite signs within
+        a group can cancel out in its sums. When True the numeric columns are
+        also digested, which never misses a difference but expands every group
+        with a difference, including those within the tolerances.
+
+        **kwargs: forwarded to the row level method.
+
+    Returns:
+        DrillDownReconciliationData: the row level reconciliation of the
+        mismatched groups, None when every group matched, along with the
+        aggregate reconciliation and the mismatched groups of every level.
+    """
+    _check_method(method)
+
+    column_indexes = convert_iterable_to_list(column_indexes)
+
+    if levels is None:
+        levels = range(1, len(column_indexes))
+
+    levels = convert_iterable_to_list(levels)
+
+    assert all(
+        lo < hi for lo, hi in zip([0] + levels, levels)
+    ), "levels must be increasing"
+    assert len(levels) == 0 or levels[-1] < len(
+        column_indexes
+    ), "levels must be shorter than the index"
+
+    columns_1, columns_2 = _get_ordered_columns(p1, p2)
+    keys_1, keys_2 = _get_key_columns(p1, p2, column_indexes)
+
+    schema = p1.collect_schema()
+    keys = set(keys_1)
+    numeric = [
+        i
+        for i, c in enumerate(columns_1)
+        if c not in keys and schema[c].is_numeric() and not digest_numeric
+    ]
+    digested = [
+        i
+        for i, c in enumerate(columns_1)
+        if c not in keys and i not in numeric
+    ]
+
+    if method != "is_equal":
+        kwargs = dict(kwargs, a_tol=a_tol, r_tol=r_tol)
+
+    reconciliations = []
+    groups_mismatched = []
+
+    filtered_1 = p1
+    filtered_2 = p2
+
+    for n_keys in levels:
+        reconciliation = reconcile(
+            _aggregate(
+                filtered_1,
+                keys_1[:n_keys],
+                [columns_1[i] for i in numeric],
+                [columns_1[i] for i in digested],
+            ),
+            _aggregate(
+                filtered_2,
+                keys_2[:n_keys],
+                [columns_2[i] for i in numeric],
+                [columns_2[i] for i in digested],
+            ),
+            column_indexes=range(0, n_keys),
+            validate_index="off",
+            a_tol=a_tol,
+            r_tol=0,
+        )
+        groups = _mismatched_groups(
+            reconciliation, reconciliation.columns_indexes
+        )
+
+        reconciliations.append(reconciliation)
+        groups_mismatched.append(groups)
+
+        if len(groups) == 0:
+            return DrillDownReconciliationData(
+                None, reconciliations, groups_mismatched
+            )
+
+        filtered_1 = _keep_groups(p1, groups, keys_1[:n_keys])
+        filtered_2 = _keep_groups(p2, groups, keys_2[:n_keys])
+
+    results = method_map[method](
+        filtered_1, filtered_2, column_indexes=column_indexes, **kwargs
+    )
+
+    return DrillDownReconciliationData(
+        results, reconciliations, groups_mismatched
+    )
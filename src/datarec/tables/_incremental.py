@@ -0,0 +1,219 @@
+import json
+import hashlib
+import pathlib as pt
+from typing import Dict, Iterable, List, Literal, Tuple, Union
+
+import polars as pl
+
+from ..data import IncrementalReconciliationData, MethodOptions
+from ..utils.functions import convert_iterable_to_list, hash_columns
+from ._partitioned import method_map, _check_method, _get_key_columns
+from ._summarizer import (
+    _moments_query,
+    _moments_frame,
+    _summary_from_moments,
+)
+
+
+def _get_ordered_columns(
+    p1: pl.LazyFrame, p2: pl.LazyFrame
+) -> Tuple[List[str], List[str]]:
+    # the columns of the right table are matched to the left ones by name,
+    # ignoring case, like the reconciler does
+    names_1 = p1.collect_schema().names()
+    names_2 = {c.lower(): c for c in p2.collect_schema().names()}
+    shared = [c for c in names_1 if c.lower() in names_2]
+    return shared, [names_2[c.lower()] for c in shared]
+
+
+def _digest_query(
+    lf: pl.LazyFrame, columns: List[str], partition_columns: List[str]
+) -> pl.LazyFrame:
+    """Row count and an order independent digest, the wrapping sum of the
+    row hashes, for every partition of a table."""
+    row_hash = hash_columns(columns)
+    return lf.group_by(partition_columns).agg(
+        pl.len().cast(pl.Int64).alias("n_rows"),
+        row_hash.sum().alias("digest"),
+        hash_columns(partition_columns).first().alias("partition"),
+    )
+
+
+def _partition_key(values: Iterable[object]) -> str:
+    return json.dumps(list(values), default=str)
+
+
+def _partition_digests(
+    digests: pl.DataFrame, n_partition_columns: int
+) -> Tuple[Dict[str, List[int]], Dict[str, int]]:
+    keys = [
+        _partition_key(row[:n_partition_columns])
+        for row in digests.iter_rows()
+    ]
+    counts = digests["n_rows"].to_list()
+    hashes = digests["digest"].to_list()
+    return (
+        {k: [int(c), int(h)] for k, c, h in zip(keys, counts, hashes)},
+        dict(zip(keys, digests["partition"].to_list())),
+    )
+
+
+def _parameters_fingerprint(**parameters) -> str:
+    return hashlib.sha256(
+        json.dumps(parameters, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+
+def _load_state(state_path: pt.Path, fingerprint: str) -> dict:
+    if state_path.exists():
+        state = json.loads(state_path.read_text())
+        if state.get("parameters") == fingerprint:
+            return state
+    return dict(parameters=fingerprint, partitions={})
+
+
+def reconcile_incremental(
+    p1: pl.LazyFrame,
+    p2: pl.LazyFrame,
+    column_indexes: Iterable[int],
+    partition_indexes: Iterable[int],
+    state_path: Union[str, pt.Path],
+    method: MethodOptions = "is_equal",
+    join: Literal["left", "right", "inner", "outer"] = "outer",
+    **kwargs,
+) -> IncrementalReconciliationData:
+    """Reconciles only the partitions which changed since the previous run.
+
+    The row count and an order independent hash of every partition of both
+    tables are stored in a json state file together with the summary moments
+    of the partition. On the next run only the partitions whose digests
+    changed are reconciled, the stored moments are reused for the rest. The
+    state is discarded when the reconciliation parameters change.
+
+    Args:
+        p1 (pl.LazyFrame): the left table.
+
+        p2 (pl.LazyFrame): the right table.
+
+        column_indexes (Iterable[int]): the index columns.
+
+        partition_indexes (Iterable[int]): the columns partitioning the
+        tables, they must be part of the index columns.
+
+        state_path (str | Path): the json file holding the digests.
+
+        method (str, optional): is_equal, is_close_numeric or reconcile.
+
+        join (str, optional): the summary join method.
+
+        **kwargs: forwarded to the reconciliation method.
+
+    Returns:
+        IncrementalReconciliationData: the reconciliation of the changed
+        partitions and the summary over every partition.
+    """
+    _check_method(method)
+
+    column_indexes = convert_iterable_to_list(column_indexes)
+    partition_indexes = convert_iterable_to_list(partition_indexes)
+
+    assert all(
+        i in column_indexes for i in partition_indexes
+    ), "partition_indexes must be part of the column_indexes"
+
+    state_path = pt.Path(state_path)
+
+    columns_1, columns_2 = _get_ordered_columns(p1, p2)
+    partitions_1, partitions_2 = _get_key_columns(p1, p2, partition_indexes)
+
+    fingerprint = _parameters_fingerprint(
+        method=method,
+        column_indexes=column_indexes,
+        partition_indexes=partition_indexes,
+        columns=[c.lower() for c in columns_1],
+        kwargs=kwargs,
+    )
+    state = _load_state(state_path, fingerprint)
+    stored = state["partitions"]
+
+    digests_1, digests_2 = pl.collect_all(
+        [
+            _digest_query(p1, columns_1, partitions_1),
+            _digest_query(p2, columns_2, partitions_2),
+        ]
+    )
+    n_keys = len(partition_indexes)
+    digests_1, hashes_1 = _partition_digests(digests_1, n_keys)
+    digests_2, hashes_2 = _partition_digests(digests_2, n_keys)
+
+    partitions = list(dict.fromkeys(list(digests_1) + list(digests_2)))
+
+    changed = [
+        key
+        for key in partitions
+        if key not in stored
+        or stored[key]["left"] != digests_1.get(key)
+        or stored[key]["right"] != digests_2.get(key)
+    ]
+    changed_set = set(changed)
+    reused = [key for key in partitions if key not in changed_set]
+
+    moments = {key: stored[key]["moments"] for key in reused}
+
+    results = None
+
+    if len(changed) > 0:
+        # partitions are selected by the hash of their key, which keeps the
+        # key types and matches null keys
+        changed_hashes = pl.Series(
+            [dict(hashes_1, **hashes_2)[key] for key in changed],
+            dtype=pl.UInt64,
+        )
+
+        def select_changed(lf: pl.LazyFrame, columns: List[str]):
+            return lf.filter(
+                hash_columns(columns).is_in(changed_hashes.implode())
+            )
+
+        results = method_map[method](
+            select_changed(p1, partitions_1),
+            select_changed(p2, partitions_2),
+            column_indexes=column_indexes,
+            **kwargs,
+        )
+
+        results_partitions = [
+            results.columns_all[i] for i in partition_indexes
+        ]
+        changed_moments = _moments_query(
+            results.results, by=results_partitions, roles=results.roles
+        ).collect()
+
+        for key in changed:
+            moments[key] = []
+
+        for row in changed_moments.iter_rows(named=True):
+            key = _partition_key([row.pop(c) for c in results_partitions])
+            moments.setdefault(key, []).append(row)
+
+    state["partitions"] = {
+        key: dict(
+            left=digests_1.get(key),
+            right=digests_2.get(key),
+            moments=moments[key],
+        )
+        for key in partitions
+    }
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    state_path.write_text(json.dumps(state, default=str))
+
+    all_moments = _moments_frame(
+        [row for key in partitions for row in moments[key]]
+    )
+
+    return IncrementalReconciliationData(
+        results,
+        _summary_from_moments(all_moments, join),
+        [json.loads(key) for key in changed],
+        [json.loads(key) for key in reused],
+    )
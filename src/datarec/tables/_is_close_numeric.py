@@ -2,11 +2,28 @@ from typing import Iterable, List
 
 import polars as pl
 
+from ..utils.functions import get_lazyframe_column_names
 from ..data import TableReconciliationData
-from ._method_base import _ReconcilerMethodBase
+from ._method_base import (
+    _ReconcilerMethodBase,
+    MaterializeOptions,
+    PreflightOptions,
+    ValidateIndexOptions,
+)
 from ._reconciler import Reconciler
 
 
+def _is_close(
+    left: pl.Expr, right: pl.Expr, a_tol: float, r_tol: float
+) -> pl.Expr:
+    difference = left - right
+    return (
+        (difference.abs() < a_tol)
+        | ((difference / ((left + right) / 2 + 1e-20)).abs() < r_tol)
+        | left.eq(right)
+    ).fill_null(pl.lit(False))
+
+
 class _ReconcilerMethodIsCloseFloat(_ReconcilerMethodBase):
     def validator(
         self, test_columns: str, merged: pl.LazyFrame, **kwargs
@@ -19,31 +36,9 @@ class _ReconcilerMethodIsCloseFloat(_ReconcilerMethodBase):
 
         validation = merged.with_columns(
             [
-                (
-                    (
-                        (
-                            (pl.col(get_left(c)) - pl.col(get_right(c))).abs()
-                            < a_tol
-                        )
-                        | (
-                            (
-                                (pl.col(get_left(c)) - pl.col(get_right(c)))
-                                / (
-                                    (
-                                        pl.col(get_left(c))
-                                        + pl.col(get_right(c))
-                                    )
-                                    / 2
-                                    + 1e-20
-                                )
-                            ).abs()
-                            < r_tol
-                        )
-                    )
-                    | (pl.col(get_left(c)).eq(pl.col(get_right(c))))
-                )
-                .fill_null(pl.lit(False))
-                .alias("%s ~*%s*~" % (c, setcase("validation")))
+                _is_close(
+                    pl.col(get_left(c)), pl.col(get_right(c)), a_tol, r_tol
+                ).alias("%s ~*%s*~" % (c, setcase("validation")))
                 for c in test_columns
             ]
         )
@@ -60,7 +55,7 @@ class _ReconcilerMethodIsCloseFloatNoIndex(_ReconcilerMethodIsCloseFloat):
         a_tol: float,
         r_tol: float
     ) -> pl.LazyFrame:
-        test_columns = list(pl1.columns)
+        test_columns = get_lazyframe_column_names(pl1)
         return super().__call__(
             pl1, pl2, test_columns, columns_to_ignore, a_tol=a_tol, r_tol=r_tol
         )
@@ -77,10 +72,9 @@ class _ReconcilerMethodIsCloseFloatWithIndex(_ReconcilerMethodIsCloseFloat):
         a_tol: float,
         r_tol: float
     ) -> pl.LazyFrame:
-        index_columns = [pl1.columns[i] for i in columns_as_indexes]
-        test_columns = list(
-            filter(lambda x: x not in index_columns, pl1.columns)
-        )
+        columns = get_lazyframe_column_names(pl1)
+        index_columns = {columns[i] for i in columns_as_indexes}
+        test_columns = [c for c in columns if c not in index_columns]
         return super().__call__(
             pl1, pl2, test_columns, columns_to_ignore, a_tol=a_tol, r_tol=r_tol
         )
@@ -97,6 +91,12 @@ def is_close_numeric(
     show_failed_first: bool = True,
     columns_to_ignore: Iterable[int] = None,
     column_indexes: Iterable[int] = None,
+    materialize: MaterializeOptions = "join",
+    streaming: bool = False,
+    approximate: bool = False,
+    sample_fraction: float = 0.01,
+    validate_index: ValidateIndexOptions = "fast",
+    preflight: PreflightOptions = "off",
     a_tol: float = 10e-3,
     r_tol: float = 10e-4,
 ) -> TableReconciliationData:
@@ -114,6 +114,59 @@ def is_close_numeric(
         show_failed_first=show_failed_first,
         columns_to_ignore=columns_to_ignore,
         column_indexes=column_indexes,
+        materialize=materialize,
+        streaming=streaming,
+        approximate=approximate,
+        sample_fraction=sample_fraction,
+        validate_index=validate_index,
+        preflight=preflight,
+        a_tol=a_tol,
+        r_tol=r_tol,
+    )
+
+
+async def is_close_numeric_async(
+    p1: pl.LazyFrame,
+    p2: pl.LazyFrame,
+    pl1_name="left",
+    pl2_name="right",
+    interlaced: bool = True,
+    column_case: str = "upper",
+    show_both_first: bool = True,
+    show_failed_first: bool = True,
+    columns_to_ignore: Iterable[int] = None,
+    column_indexes: Iterable[int] = None,
+    materialize: MaterializeOptions = "join",
+    streaming: bool = False,
+    approximate: bool = False,
+    sample_fraction: float = 0.01,
+    validate_index: ValidateIndexOptions = "fast",
+    preflight: PreflightOptions = "off",
+    a_tol: float = 10e-3,
+    r_tol: float = 10e-4,
+) -> TableReconciliationData:
+    """Awaitable counterpart of is_close_numeric, the eager collections are
+    awaited with the polars async collection."""
+    return await Reconciler(
+        _ReconcilerMethodIsCloseFloatNoIndex,
+        _ReconcilerMethodIsCloseFloatWithIndex,
+    ).call_async(
+        p1,
+        p2,
+        pl1_name=pl1_name,
+        pl2_name=pl2_name,
+        interlaced=interlaced,
+        column_case=column_case,
+        show_both_first=show_both_first,
+        show_failed_first=show_failed_first,
+        columns_to_ignore=columns_to_ignore,
+        column_indexes=column_indexes,
+        materialize=materialize,
+        streaming=streaming,
+        approximate=approximate,
+        sample_fraction=sample_fraction,
+        validate_index=validate_index,
+        preflight=preflight,
         a_tol=a_tol,
         r_tol=r_tol,
     )
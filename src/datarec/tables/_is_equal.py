@@ -4,10 +4,23 @@ import polars as pl
 
 from ..utils.functions import get_lazyframe_column_names
 from ..data import TableReconciliationData
-from ._method_base import _ReconcilerMethodBase
+from ._method_base import (
+    _ReconcilerMethodBase,
+    MaterializeOptions,
+    PreflightOptions,
+    ValidateIndexOptions,
+)
 from ._reconciler import Reconciler
 
 
+def _is_equal(left: pl.Expr, right: pl.Expr) -> pl.Expr:
+    return (
+        pl.when(left.is_null() & right.is_null())
+        .then(pl.lit(True))
+        .otherwise(left == right)
+    )
+
+
 class _IsEqualReconcilerMethodBase(_ReconcilerMethodBase):
     def validator(
         self, test_columns: str, merged: pl.LazyFrame
@@ -18,13 +31,9 @@ class _IsEqualReconcilerMethodBase(_ReconcilerMethodBase):
 
         validation = merged.with_columns(
             [
-                pl.when(
-                    pl.col(get_left(c)).is_null()
-                    & pl.col(get_right(c)).is_null()
+                _is_equal(pl.col(get_left(c)), pl.col(get_right(c))).alias(
+                    "%s ~*%s*~" % (c, setcase("validation"))
                 )
-                .then(pl.lit(True))
-                .otherwise(pl.col(get_left(c)) == pl.col(get_right(c)))
-                .alias("%s ~*%s*~" % (c, setcase("validation")))
                 for c in test_columns
             ]
         )
@@ -39,7 +48,7 @@ class _IsEqualReconcilerMethodeNoIndex(_IsEqualReconcilerMethodBase):
         pl2: pl.LazyFrame,
         columns_to_ignore: T.List[int],
     ) -> pl.LazyFrame:
-        test_columns = list(pl1.columns)
+        test_columns = get_lazyframe_column_names(pl1)
         return super().__call__(pl1, pl2, test_columns, columns_to_ignore)
 
 
@@ -51,15 +60,124 @@ class _IsEqualReconcilerMethodWithIndex(_IsEqualReconcilerMethodBase):
         columns_to_ignore: T.List[int],
         columns_as_indexes: T.List[str],
     ) -> pl.LazyFrame:
-        index_columns = [
-            get_lazyframe_column_names(pl1)[i] for i in columns_as_indexes
-        ]
-        test_columns = list(
-            filter(lambda x: x not in index_columns, pl1.collect_schema().names())
-        )
+        columns = get_lazyframe_column_names(pl1)
+        index_columns = {columns[i] for i in columns_as_indexes}
+        test_columns = [c for c in columns if c not in index_columns]
         return super().__call__(pl1, pl2, test_columns, columns_to_ignore)
 
 
+class _IsEqualReconcilerMethodHashFirst(_IsEqualReconcilerMethodBase):
+    """Joins a 64-bit hash of the tested columns before joining any payload.
+    Only rows whose hashes differ, or which are found in a single table, have
+    their columns joined and validated. Identical rows are reported as passed
+    with their suffixed columns left empty.
+    """
+
+    def __call__(
+        self,
+        pl1: pl.LazyFrame,
+        pl2: pl.LazyFrame,
+        test_columns: T.List[str],
+        columns_to_ignore: T.List[int],
+        **kwargs
+    ) -> pl.LazyFrame:
+        if self.identical:
+            # without differing rows there is nothing to hash
+            return _ReconcilerMethodBase.__call__(
+                self, pl1, pl2, test_columns, columns_to_ignore, **kwargs
+            )
+
+        get_left = self.methods.get_left
+        get_right = self.methods.get_right
+        setcase = self.methods.setcase
+
+        original_columns = get_lazyframe_column_names(pl1).copy()
+
+        ignore = {test_columns[i] for i in columns_to_ignore}
+        hashed_columns = [c for c in test_columns if c not in ignore]
+
+        if len(test_columns) == len(original_columns):
+            pl1 = pl1.with_row_index(name="row_number")
+            pl2 = pl2.with_row_index(name="row_number")
+            index_columns = ["row_number"]
+        else:
+            tested = set(test_columns)
+            index_columns = [c for c in original_columns if c not in tested]
+
+        fingerprint = setcase("~*hash*~")
+
+        def digest(lf: pl.LazyFrame, location: str) -> pl.LazyFrame:
+            if len(hashed_columns) > 0:
+                row_hash = pl.struct(hashed_columns).hash()
+            else:
+                row_hash = pl.lit(0, dtype=pl.UInt64)
+            return self.locate(
+                lf.select(index_columns + [row_hash.alias(fingerprint)]),
+                [fingerprint],
+                get_left if location == "**left**" else get_right,
+                location,
+            )
+
+        digests = digest(pl1, "**left**").join(
+            digest(pl2, "**right**"),
+            how="full",
+            on=index_columns,
+            coalesce=True,
+        )
+        digests = self.materialize_join(digests)
+
+        identical = digests.filter(
+            pl.col(get_left(fingerprint)) == pl.col(get_right(fingerprint))
+        ).select(index_columns)
+
+        # rows with null keys never match, an anti join keeps them expanded
+        pl1 = pl1.join(identical, on=index_columns, how="anti")
+        pl2 = pl2.join(identical, on=index_columns, how="anti")
+
+        pl1 = self.locate(pl1, test_columns, get_left, "**left**")
+        pl2 = self.locate(pl2, test_columns, get_right, "**right**")
+
+        merged = pl1.join(pl2, how="full", on=index_columns, coalesce=True)
+        merged = self.materialize_join(merged)
+        merged = self.fill_locations(merged)
+
+        differing = self.validator(hashed_columns, merged, **kwargs)
+
+        identical = identical.with_columns(
+            [pl.lit(True).alias(setcase(c)) for c in ["**left**", "**right**"]]
+            + [
+                pl.lit(True).alias("%s ~*%s*~" % (c, setcase("validation")))
+                for c in hashed_columns
+            ]
+        )
+
+        validation = pl.concat([differing, identical], how="diagonal_relaxed")
+
+        return self.flag_both(validation)
+
+
+class _IsEqualReconcilerMethodHashFirstNoIndex(
+    _IsEqualReconcilerMethodeNoIndex, _IsEqualReconcilerMethodHashFirst
+): ...
+
+
+class _IsEqualReconcilerMethodHashFirstWithIndex(
+    _IsEqualReconcilerMethodWithIndex, _IsEqualReconcilerMethodHashFirst
+): ...
+
+
+def _get_reconciler(hash_first: bool) -> Reconciler:
+    if hash_first:
+        return Reconciler(
+            _IsEqualReconcilerMethodHashFirstNoIndex,
+            _IsEqualReconcilerMethodHashFirstWithIndex,
+        )
+    return Reconciler(
+        _IsEqualReconcilerMethodeNoIndex,
+        _IsEqualReconcilerMethodWithIndex,
+    )
+
+
 def is_equal(
     p1: pl.LazyFrame,
     p2: pl.LazyFrame,
@@ -71,10 +189,56 @@ def is_equal(
     show_failed_first: bool = True,
     columns_to_ignore: T.Iterable[int] = None,
     column_indexes: T.Iterable[int] = None,
+    materialize: MaterializeOptions = "join",
+    streaming: bool = False,
+    approximate: bool = False,
+    sample_fraction: float = 0.01,
+    validate_index: ValidateIndexOptions = "fast",
+    preflight: PreflightOptions = "off",
+    hash_first: bool = False,
 ) -> TableReconciliationData:
-    return Reconciler(
-        _IsEqualReconcilerMethodeNoIndex, _IsEqualReconcilerMethodWithIndex
-    )(
+    return _get_reconciler(hash_first)(
+        p1,
+        p2,
+        pl1_name=pl1_name,
+        pl2_name=pl2_name,
+        interlaced=interlaced,
+        column_case=column_case,
+        show_both_first=show_both_first,
+        show_failed_first=show_failed_first,
+        columns_to_ignore=columns_to_ignore,
+        column_indexes=column_indexes,
+        materialize=materialize,
+        streaming=streaming,
+        approximate=approximate,
+        sample_fraction=sample_fraction,
+        validate_index=validate_index,
+        preflight=preflight,
+    )
+
+
+async def is_equal_async(
+    p1: pl.LazyFrame,
+    p2: pl.LazyFrame,
+    pl1_name="left",
+    pl2_name="right",
+    interlaced: bool = True,
+    column_case: str = "upper",
+    show_both_first: bool = True,
+    show_failed_first: bool = True,
+    columns_to_ignore: T.Iterable[int] = None,
+    column_indexes: T.Iterable[int] = None,
+    materialize: MaterializeOptions = "join",
+    streaming: bool = False,
+    approximate: bool = False,
+    sample_fraction: float = 0.01,
+    validate_index: ValidateIndexOptions = "fast",
+    preflight: PreflightOptions = "off",
+    hash_first: bool = False,
+) -> TableReconciliationData:
+    """Awaitable counterpart of is_equal, the eager collections are awaited
+    with the polars async collection."""
+    return await _get_reconciler(hash_first).call_async(
         p1,
         p2,
         pl1_name=pl1_name,
@@ -85,4 +249,10 @@ def is_equal(
         show_failed_first=show_failed_first,
         columns_to_ignore=columns_to_ignore,
         column_indexes=column_indexes,
+        materialize=materialize,
+        streaming=streaming,
+        approximate=approximate,
+        sample_fraction=sample_fraction,
+        validate_index=validate_index,
+        preflight=preflight,
     )
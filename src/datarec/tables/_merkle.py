@@ -0,0 +1,180 @@
+from typing import Dict, Iterable, List, Literal, Optional
+
+import polars as pl
+
+from ..data import MerkleReconciliationData, MethodOptions
+from ..utils.functions import (
+    convert_iterable_to_list,
+    get_lazyframe_column_names,
+    hash_columns,
+)
+from ._incremental import _get_ordered_columns
+from ._partitioned import method_map, _check_method, _get_key_columns
+
+
+def _range_expr(columns: List[str], depth: int) -> pl.Expr:
+    # the leading bits of the key hash select the range, so both tables split
+    # the sorted hash space at the same boundaries
+    return (
+        hash_columns(columns) // pl.lit(2 ** (64 - depth), dtype=pl.UInt64)
+    ).alias("range")
+
+
+def range_digests(
+    lf: pl.LazyFrame, column_indexes: Iterable[int], depth: int = 16
+) -> pl.LazyFrame:
+    """Computes the leaf digests of a merkle tree over a table.
+
+    The rows are split into 2**depth ranges of the sorted 64-bit hash space of
+    their index columns, each leaf holds the row count and the wrapping sum of
+    the row hashes of its range. The digest is a plain lazy aggregation, it
+    can be computed wherever the table lives and only the leaves, at most
+    2**depth rows, have to be moved.
+
+    Args:
+        lf (pl.LazyFrame): the table to digest, tables compared with each
+        other must list their columns in the same order.
+
+        column_indexes (Iterable[int]): the index columns.
+
+        depth (int, optional): the depth of the tree. Defaults to 16.
+
+    Returns:
+        pl.LazyFrame: the range, n_rows and digest of every non empty leaf.
+    """
+    assert 0 < depth < 64, "depth must be between 1 and 63"
+
+    columns = get_lazyframe_column_names(lf)
+    index_columns = [
+        columns[i] for i in convert_iterable_to_list(column_indexes)
+    ]
+    row_hash = hash_columns(columns)
+
+    return lf.group_by(_range_expr(index_columns, depth)).agg(
+        pl.len().cast(pl.Int64).alias("n_rows"),
+        row_hash.sum().alias("digest"),
+    )
+
+
+def _build_tree(leaves: pl.DataFrame, depth: int) -> List[Dict[int, tuple]]:
+    """Folds the leaves into the levels of the tree, level 0 is the root."""
+    levels = [None] * (depth + 1)
+    level = leaves.select("range", "n_rows", "digest")
+    for d in range(depth, -1, -1):
+        levels[d] = {
+            r: (n, h)
+            for r, n, h in zip(
+                level["range"].to_list(),
+                level["n_rows"].to_list(),
+                level["digest"].to_list(),
+            )
+        }
+        level = level.group_by(pl.col("range") // 2).agg(
+            pl.col("n_rows").sum(), pl.col("digest").sum()
+        )
+    return levels
+
+
+def compare_range_digests(
+    leaves_1: pl.DataFrame, leaves_2: pl.DataFrame, depth: int = 16
+) -> List[int]:
+    """Compares two merkle trees top-down and returns the mismatched leaves.
+
+    Args:
+        leaves_1 (pl.DataFrame): the collected range_digests of a table.
+
+        leaves_2 (pl.DataFrame): the collected range_digests of another table.
+
+        depth (int, optional): the depth both digests were computed with.
+
+    Returns:
+        list[int]: the ranges whose digests differ.
+    """
+    tree_1 = _build_tree(leaves_1, depth)
+    tree_2 = _build_tree(leaves_2, depth)
+
+    mismatched = [0]
+    for d in range(depth + 1):
+        mismatched = [
+            r for r in mismatched if tree_1[d].get(r) != tree_2[d].get(r)
+        ]
+        if d < depth:
+            mismatched = [c for r in mismatched for c in (2 * r, 2 * r + 1)]
+
+    return mismatched
+
+
+def reconcile_merkle(
+    p1: pl.LazyFrame,
+    p2: pl.LazyFrame,
+    column_indexes: Iterable[int],
+    method: MethodOptions = "is_equal",
+    depth: int = 16,
+    digests_1: Optional[pl.LazyFrame] = None,
+    digests_2: Optional[pl.LazyFrame] = None,
+    **kwargs,
+) -> MerkleReconciliationData:
+    """Reconciles only the key ranges whose merkle digests differ.
+
+    Args:
+        p1 (pl.LazyFrame): the left table.
+
+        p2 (pl.LazyFrame): the right table.
+
+        column_indexes (Iterable[int]): the index columns.
+
+        method (str, optional): is_equal, is_close_numeric or reconcile.
+
+        depth (int, optional): the depth of the merkle trees.
+
+        digests_1 (pl.LazyFrame, optional): precomputed range_digests of the
+        left table, computed from p1 when not given.
+
+        digests_2 (pl.LazyFrame, optional): precomputed range_digests of the
+        right table, computed from p2 when not given.
+
+        **kwargs: forwarded to the reconciliation method.
+
+    Returns:
+        MerkleReconciliationData: the reconciliation of the mismatched ranges.
+    """
+    _check_method(method)
+
+    column_indexes = convert_iterable_to_list(column_indexes)
+    columns_1, columns_2 = _get_ordered_columns(p1, p2)
+    keys_1, keys_2 = _get_key_columns(p1, p2, column_indexes)
+
+    if digests_1 is None:
+        digests_1 = range_digests(p1.select(columns_1), column_indexes, depth)
+
+    if digests_2 is None:
+        digests_2 = range_digests(p2.select(columns_2), column_indexes, depth)
+
+    leaves_1, leaves_2 = pl.collect_all([digests_1, digests_2])
+
+    mismatched = compare_range_digests(leaves_1, leaves_2, depth)
+    mismatched_series = pl.Series(mismatched, dtype=pl.UInt64).implode()
+
+    def n_matched(leaves: pl.DataFrame) -> int:
+        matched = leaves.filter(
+            pl.col("range").is_in(mismatched_series).not_()
+        )
+        return int(matched["n_rows"].sum())
+
+    results = None
+
+    if len(mismatched) > 0:
+        results = method_map[method](
+            p1.filter(_range_expr(keys_1, depth).is_in(mismatched_series)),
+            p2.filter(_range_expr(keys_2, depth).is_in(mismatched_series)),
+            column_indexes=column_indexes,
+            **kwargs,
+        )
+
+    return MerkleReconciliationData(
+        results,
+        depth,
+        mismatched,
+        n_matched(leaves_1),
+        n_matched(leaves_2),
+    )
@@ -7,16 +7,66 @@ import polars as pl
 from ..data import MethodData
 from ..utils.functions import get_lazyframe_column_names
 
+MaterializeOptions = T.Literal["never", "join", "auto"]
+ValidateIndexOptions = T.Literal["fast", "full", "off"]
+PreflightOptions = T.Literal["off", "check", "skip", "stop"]
+
 
 @dataclass
 class _ReconcilerMethodBase(abc.ABC):
     methods: MethodData
+    materialize: MaterializeOptions = "join"
+    identical: bool = False
 
     @abc.abstractmethod
     def validator(
         self, test_columns: str, merged: pl.LazyFrame
     ) -> pl.LazyFrame: ...
 
+    def materialize_join(self, merged: pl.LazyFrame) -> pl.LazyFrame:
+        """Applies the materialization policy to the joined frame.
+
+        - never: the join stays part of the lazy plan, so projections and
+          predicates applied downstream are pushed down to the sources.
+        - join: the join is collected into memory before validation.
+        - auto: the join stays lazy, the reconciler memoizes the results so
+          they are materialized once they are used a second time.
+        """
+        if self.materialize == "join":
+            return merged.collect().lazy()
+        return merged
+
+    def locate(
+        self,
+        lf: pl.LazyFrame,
+        columns: T.List[str],
+        get_suffixed: T.Callable,
+        location: str,
+    ) -> pl.LazyFrame:
+        """Suffixes the given columns with the table name and flags every row
+        with the location of the table."""
+        lf = lf.rename({c: get_suffixed(c) for c in columns})
+        return lf.with_columns(
+            pl.lit(True).alias(self.methods.setcase(location))
+        )
+
+    def fill_locations(self, merged: pl.LazyFrame) -> pl.LazyFrame:
+        setcase = self.methods.setcase
+        return merged.with_columns(
+            [
+                pl.col(setcase(c)).fill_null(pl.lit(False))
+                for c in ["**left**", "**right**"]
+            ]
+        )
+
+    def flag_both(self, validation: pl.LazyFrame) -> pl.LazyFrame:
+        setcase = self.methods.setcase
+        return validation.with_columns(
+            (pl.col(setcase("**left**")) & pl.col(setcase("**right**"))).alias(
+                setcase("**both**")
+            )
+        )
+
     def __call__(
         self,
         pl1: pl.LazyFrame,
@@ -27,61 +77,52 @@ class _ReconcilerMethodBase(abc.ABC):
     ) -> pl.LazyFrame:
         get_left = self.methods.get_left
         get_right = self.methods.get_right
-        setcase = self.methods.setcase
 
         original_columns = get_lazyframe_column_names(pl1).copy()
 
-        pl1 = pl1.rename({c: get_left(c) for c in test_columns})
-        pl1 = pl1.with_columns(pl.lit(True).alias(setcase("**left**")))
-        pl2 = pl2.rename({c: get_right(c) for c in test_columns})
-        pl2 = pl2.with_columns(pl.lit(True).alias(setcase("**right**")))
+        pl1 = self.locate(pl1, test_columns, get_left, "**left**")
+        pl2 = self.locate(pl2, test_columns, get_right, "**right**")
 
         original_test_columns = test_columns.copy()
 
         if len(columns_to_ignore) > 0:
-            ignore = list(map(lambda x: test_columns[x], columns_to_ignore))
-            test_columns = filter(lambda x: x not in ignore, test_columns)
-
-        if not (len(original_test_columns) == len(original_columns)):
-            merged = (
-                pl1.join(
-                    pl2,
-                    how="full",
-                    on=[
-                        c
-                        for c in get_lazyframe_column_names(pl1)
-                        if c in original_columns
-                    ],
-                )
-                .collect()
-                .lazy()
+            ignore = {test_columns[i] for i in columns_to_ignore}
+            test_columns = [c for c in test_columns if c not in ignore]
+
+        if self.identical:
+            # the preflight proved both tables hold the same rows, the right
+            # columns, ignored ones included, are copies of the left ones and
+            # no join is needed
+            merged = pl1.with_columns(
+                [
+                    pl.col(get_left(c)).alias(get_right(c))
+                    for c in original_test_columns
+                ]
+                + [pl.lit(True).alias(self.methods.setcase("**right**"))]
+            )
+            if len(original_test_columns) == len(original_columns):
+                merged = merged.with_row_index(name="row_number")
+        elif not (len(original_test_columns) == len(original_columns)):
+            # the join keys are the original columns which were not suffixed
+            suffixed = set(original_test_columns)
+            merged = pl1.join(
+                pl2,
+                how="full",
+                on=[c for c in original_columns if c not in suffixed],
+                coalesce=True,
             )
         else:
-            merged = (
-                (
-                    pl1.with_row_count(name="row_number").join(
-                        pl2.with_row_count(name="row_number"),
-                        how="outer",
-                        on=["row_number"],
-                    )
-                )
-                .collect()
-                .lazy()
+            merged = pl1.with_row_index(name="row_number").join(
+                pl2.with_row_index(name="row_number"),
+                how="full",
+                on=["row_number"],
+                coalesce=True,
             )
 
-        merged = merged.with_columns(
-            [
-                pl.col(setcase(c)).fill_null(pl.lit(False))
-                for c in ["**left**", "**right**"]
-            ]
-        )
+        merged = self.materialize_join(merged)
 
-        validation = self.validator(test_columns, merged, **kwargs)
+        merged = self.fill_locations(merged)
 
-        validation = validation.with_columns(
-            (pl.col(setcase("**left**")) & pl.col(setcase("**right**"))).alias(
-                setcase("**both**")
-            )
-        )
+        validation = self.validator(test_columns, merged, **kwargs)
 
-        return validation
+        return self.flag_both(validation)
@@ -0,0 +1,272 @@
+import os
+import threading
+import pathlib as pt
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Literal, Optional, Tuple, Union
+
+import polars as pl
+
+from ..data import (
+    MethodOptions,
+    TableReconciliationData,
+    TableReconciliationSummarizationData,
+)
+from ..utils.functions import convert_iterable_to_list, hash_columns
+from ._is_equal import is_equal
+from ._is_close_numeric import is_close_numeric
+from ._reconcile import reconcile
+from ._summarizer import _moments_query, _summary_from_moments
+
+method_map = {
+    "is_equal": is_equal,
+    "is_close_numeric": is_close_numeric,
+    "reconcile": reconcile,
+}
+
+
+def _check_method(method: str):
+    assert method in method_map, "method is either %s" % " or ".join(
+        method_map
+    )
+
+
+# the workers inherit their thread limit from the environment they are spawned
+# with, the pools of concurrent calls are spawned one at a time
+_spawn_lock = threading.Lock()
+
+
+def _partition_expr(columns: List[str], n_partitions: int) -> pl.Expr:
+    return hash_columns(columns) % n_partitions
+
+
+def _split(
+    lf: pl.LazyFrame, keys: List[str], n_partitions: int
+) -> List[pl.LazyFrame]:
+    """The partitions of a table sent to the workers.
+
+    A plan over scans is sent filtered on its partition, every worker reads
+    its own partition from the source. A plan over in-memory data would pickle
+    the whole data into every task, so it is collected and split once in the
+    parent and every task carries its own partition alone.
+    """
+    partition = _partition_expr(keys, n_partitions)
+
+    if "DF [" not in lf.explain(optimized=False):
+        return [lf.filter(partition == i) for i in range(n_partitions)]
+
+    df = lf.with_columns(partition.alias("~partition~")).collect()
+    partitions = df.partition_by(
+        "~partition~", as_dict=True, include_key=False
+    )
+    empty = df.clear().drop("~partition~")
+
+    return [partitions.get((i,), empty).lazy() for i in range(n_partitions)]
+
+
+def _get_key_columns(
+    p1: pl.LazyFrame, p2: pl.LazyFrame, column_indexes: List[int]
+) -> Tuple[List[str], List[str]]:
+    schema_1 = p1.collect_schema()
+    schema_2 = p2.collect_schema()
+    names_2 = {c.lower(): c for c in schema_2.names()}
+
+    keys_1 = [schema_1.names()[i] for i in column_indexes]
+    keys_2 = [names_2[c.lower()] for c in keys_1]
+
+    for k1, k2 in zip(keys_1, keys_2):
+        assert (
+            schema_1[k1] == schema_2[k2]
+        ), f"index column {k1} must have the same type in both tables, \
+            found {schema_1[k1]} and {schema_2[k2]}"
+
+    return keys_1, keys_2
+
+
+def _reconcile_partition(
+    method: str,
+    p1: pl.LazyFrame,
+    p2: pl.LazyFrame,
+    results_path: Optional[str],
+    kwargs: dict,
+) -> Tuple[Union[pl.DataFrame, str], pl.DataFrame, dict]:
+    reconciliation = method_map[method](p1, p2, **kwargs)
+
+    if results_path is None:
+        results = reconciliation.results.collect()
+        moments = _moments_query(
+            results.lazy(), roles=reconciliation.roles
+        ).collect()
+    else:
+        results, moments = pl.collect_all(
+            [
+                reconciliation.results.sink_parquet(results_path, lazy=True),
+                _moments_query(
+                    reconciliation.results, roles=reconciliation.roles
+                ),
+            ]
+        )
+        results = results_path
+
+    metadata = dict(
+        left=reconciliation.left,
+        right=reconciliation.right,
+        columns_all=reconciliation.columns_all,
+        columns_indexes=reconciliation.columns_indexes,
+        columns_ignored=reconciliation.columns_ignored,
+        columns_tested=reconciliation.columns_tested,
+        sample_fraction=reconciliation.sample_fraction,
+    )
+
+    return results, moments, metadata
+
+
+def reconcile_partitioned(
+    p1: pl.LazyFrame,
+    p2: pl.LazyFrame,
+    column_indexes: Iterable[int],
+    method: MethodOptions = "is_equal",
+    n_partitions: int = 8,
+    max_workers: Optional[int] = None,
+    threads_per_worker: Optional[int] = None,
+    results_dir: Optional[Union[str, pt.Path]] = None,
+    join: Literal["left", "right", "inner", "outer"] = "outer",
+    show_both_first: bool = True,
+    show_failed_first: bool = True,
+    **kwargs,
+) -> Tuple[TableReconciliationData, TableReconciliationSummarizationData]:
+    """Reconciles two tables partition by partition in a process pool.
+
+    Both tables are bucketed by a hash of their index columns, every bucket
+    holds the same keys on both sides and is reconciled independently in a
+    worker process. The per-partition results and summary moments are then
+    merged into a single reconciliation and summary.
+
+    Tables scanned from files or databases are sent to the workers as plans
+    and every worker reads its own partition. Tables holding in-memory data are
+    collected and split in the parent process instead, so that every worker
+    only receives its own partition.
+
+    Args:
+        p1 (pl.LazyFrame): the left table.
+
+        p2 (pl.LazyFrame): the right table.
+
+        column_indexes (Iterable[int]): the index columns, partitioning
+        requires an index.
+
+        method (str, optional): is_equal, is_close_numeric or reconcile.
+
+        n_partitions (int, optional): the number of hash partitions.
+
+        max_workers (int, optional): the size of the process pool, defaults to
+        the number of cpus.
+
+        threads_per_worker (int, optional): the size of the polars thread pool
+        in each worker, defaults to splitting the cpus between the workers.
+
+        results_dir (str | Path, optional): when given, each worker writes its
+        results to a parquet file in this directory instead of returning them
+        to the parent process.
+
+        join (str, optional): the summary join method.
+
+        **kwargs: forwarded to the reconciliation method.
+
+    Returns:
+        Tuple[TableReconciliationData, TableReconciliationSummarizationData]:
+        the merged reconciliation and its summary.
+    """
+    _check_method(method)
+
+    column_indexes = convert_iterable_to_list(column_indexes)
+
+    assert len(column_indexes) > 0, "partitioning requires column_indexes"
+
+    keys_1, keys_2 = _get_key_columns(p1, p2, column_indexes)
+
+    if max_workers is None:
+        max_workers = min(n_partitions, os.cpu_count() or 1)
+
+    if threads_per_worker is None:
+        threads_per_worker = max(1, (os.cpu_count() or 1) // max_workers)
+
+    if results_dir is not None:
+        results_dir = pt.Path(results_dir)
+        results_dir.mkdir(parents=True, exist_ok=True)
+
+    kwargs = dict(
+        kwargs,
+        column_indexes=column_indexes,
+        show_both_first=False,
+        show_failed_first=False,
+    )
+
+    partitions_1 = _split(p1, keys_1, n_partitions)
+    partitions_2 = _split(p2, keys_2, n_partitions)
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    ) as executor:
+        # polars sizes its thread pool when it is imported, and a spawned
+        # worker imports the main module, polars with it, before an executor
+        # initializer runs. The workers take the thread limit from the
+        # environment they are spawned with instead, they are all spawned by
+        # the submissions below and the environment is restored right after.
+        with _spawn_lock:
+            previous_threads = os.environ.get("POLARS_MAX_THREADS")
+            os.environ["POLARS_MAX_THREADS"] = str(threads_per_worker)
+
+            try:
+                futures = [
+                    executor.submit(
+                        _reconcile_partition,
+                        method,
+                        partitions_1[partition],
+                        partitions_2[partition],
+                        (
+                            None
+                            if results_dir is None
+                            else (
+                                results_dir
+                                / ("partition-%d.parquet" % partition)
+                            ).as_posix()
+                        ),
+                        kwargs,
+                    )
+                    for partition in range(n_partitions)
+                ]
+            finally:
+                if previous_threads is None:
+                    del os.environ["POLARS_MAX_THREADS"]
+                else:
+                    os.environ["POLARS_MAX_THREADS"] = previous_threads
+
+        outputs = [f.result() for f in futures]
+
+    if results_dir is None:
+        results = pl.concat([o[0] for o in outputs], how="vertical").lazy()
+    else:
+        results = pl.scan_parquet([o[0] for o in outputs])
+
+    moments = pl.concat([o[1] for o in outputs], how="vertical")
+    metadata = outputs[0][2]
+
+    reconciliation = TableReconciliationData(
+        results, unsorted_results=results, **metadata
+    )
+
+    if show_failed_first:
+        reconciliation.results = reconciliation.results.sort(
+            by=reconciliation.validation_columns
+        )
+
+    if show_both_first:
+        reconciliation.results = reconciliation.results.sort(
+            by=reconciliation.is_intersection_col, descending=True
+        )
+
+    return reconciliation, _summary_from_moments(
+        moments, join, reconciliation.sample_fraction
+    )
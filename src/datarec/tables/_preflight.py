@@ -0,0 +1,225 @@
+import math
+from typing import Any, Dict, Iterable, List
+
+import polars as pl
+
+from ..data import PreflightData
+from ..utils import SetCase
+from ..utils.functions import (
+    convert_iterable_to_list,
+    get_formated_ordered_union,
+    get_lazyframe_column_names,
+    hash_columns,
+)
+
+
+def _statistics(column: str, dtype: pl.DataType) -> Dict[str, pl.Expr]:
+    c = pl.col(column)
+    statistics = dict(null_count=c.null_count())
+    if (
+        dtype.is_numeric()
+        or dtype.is_temporal()
+        or dtype in (pl.String, pl.Boolean)
+    ):
+        statistics.update(min=c.min(), max=c.max())
+    if dtype.is_numeric():
+        statistics.update(sum=c.sum())
+    return statistics
+
+
+def _row_hash(columns: List[str], ordered: bool) -> pl.Expr:
+    """The hash of every row, along with its row number when the rows are
+    matched by position."""
+    row_hash = hash_columns(columns)
+    if ordered:
+        row_hash = pl.struct(
+            [pl.int_range(pl.len(), dtype=pl.UInt32).alias("row"), row_hash]
+        ).hash()
+    return row_hash
+
+
+def _profile_query(
+    lf: pl.LazyFrame, schema: pl.Schema, ordered: bool
+) -> pl.LazyFrame:
+    """A single aggregation with the row count, the sum of the row hashes and
+    the statistics of every column. Without an index the rows are matched by
+    position, so the row number is hashed with the row."""
+    columns = schema.names()
+    row_hash = _row_hash(columns, ordered)
+
+    aggregations = [pl.len().alias("n_rows"), row_hash.sum().alias("hash")]
+    for i, column in enumerate(columns):
+        aggregations.extend(
+            e.alias("%d %s" % (i, name))
+            for name, e in _statistics(column, schema[column]).items()
+        )
+
+    return lf.select(aggregations)
+
+
+def _is_same(statistic: str, left: Any, right: Any) -> bool:
+    # sums of floats depend on the order of the rows
+    if statistic == "sum" and isinstance(left, float) and right is not None:
+        return math.isclose(left, right, rel_tol=1e-9)
+    return left == right
+
+
+def _preflight_from_profiles(
+    schema_1: pl.Schema,
+    schema_2: pl.Schema,
+    profile_1: Dict[str, Any],
+    profile_2: Dict[str, Any],
+) -> PreflightData:
+    columns_mismatched = [c for c in schema_1 if schema_1[c] != schema_2[c]]
+    # numeric columns of different types may still hold equal values, their
+    # statistics are compared and only the row join can tell
+    columns_incompatible = [
+        c
+        for c in columns_mismatched
+        if not (schema_1[c].is_numeric() and schema_2[c].is_numeric())
+    ]
+
+    rows = []
+    for i, column in enumerate(schema_1):
+        if column in columns_incompatible:
+            continue
+        for name in _statistics(column, schema_1[column]):
+            left = profile_1["%d %s" % (i, name)]
+            right = profile_2["%d %s" % (i, name)]
+            rows.append(
+                dict(
+                    column=column,
+                    statistic=name,
+                    left=None if left is None else str(left),
+                    right=None if right is None else str(right),
+                    equal=_is_same(name, left, right),
+                )
+            )
+
+    profile = pl.DataFrame(
+        rows,
+        schema=dict(
+            column=pl.String,
+            statistic=pl.String,
+            left=pl.String,
+            right=pl.String,
+            equal=pl.Boolean,
+        ),
+    )
+
+    differing = set(r["column"] for r in rows if not r["equal"])
+    columns_differing = [c for c in schema_1 if c in differing]
+
+    if (
+        len(columns_incompatible) > 0
+        or profile_1["n_rows"] != profile_2["n_rows"]
+    ):
+        verdict = "fail"
+    elif (
+        len(columns_mismatched) == 0 and profile_1["hash"] == profile_2["hash"]
+    ):
+        verdict = "pass"
+    else:
+        verdict = "unknown"
+
+    return PreflightData(
+        verdict,
+        profile_1["n_rows"],
+        profile_2["n_rows"],
+        columns_mismatched,
+        columns_differing,
+        profile,
+    )
+
+
+def _preflight_queries(
+    pl1: pl.LazyFrame, pl2: pl.LazyFrame, ordered: bool
+) -> List[pl.LazyFrame]:
+    return [
+        _profile_query(pl1, pl1.collect_schema(), ordered),
+        _profile_query(pl2, pl2.collect_schema(), ordered),
+    ]
+
+
+def run_preflight(
+    pl1: pl.LazyFrame, pl2: pl.LazyFrame, ordered: bool, engine: str
+) -> PreflightData:
+    """Runs the preflight checks of two aligned tables, both profiles are
+    collected concurrently in a single pass."""
+    profile_1, profile_2 = pl.collect_all(
+        _preflight_queries(pl1, pl2, ordered), engine=engine
+    )
+    return _preflight_from_profiles(
+        pl1.collect_schema(),
+        pl2.collect_schema(),
+        profile_1.row(0, named=True),
+        profile_2.row(0, named=True),
+    )
+
+
+async def run_preflight_async(
+    pl1: pl.LazyFrame, pl2: pl.LazyFrame, ordered: bool, engine: str
+) -> PreflightData:
+    profile_1, profile_2 = await pl.collect_all_async(
+        _preflight_queries(pl1, pl2, ordered), engine=engine
+    )
+    return _preflight_from_profiles(
+        pl1.collect_schema(),
+        pl2.collect_schema(),
+        profile_1.row(0, named=True),
+        profile_2.row(0, named=True),
+    )
+
+
+def preflight(
+    p1: pl.LazyFrame,
+    p2: pl.LazyFrame,
+    column_indexes: Iterable[int] = None,
+    column_case: str = "upper",
+    streaming: bool = False,
+) -> PreflightData:
+    """Checks two tables with one aggregate query per table before any row is
+    joined.
+
+    The schemas, the row counts, the null counts and the sum, minimum and
+    maximum of every column are compared, along with an order independent sum
+    of the row hashes. Equal hashes prove that the tables hold the same rows,
+    differing row counts or column types prove that they do not reconcile.
+    Numeric columns of different types, such as Int64 and Float64, may still
+    reconcile and leave the verdict unknown.
+
+    Args:
+        p1 (pl.LazyFrame): the left table.
+
+        p2 (pl.LazyFrame): the right table.
+
+        column_indexes (Iterable[int], optional): the index columns of the
+        reconciliation. Without an index rows are matched by position and the
+        order of the rows is part of the hash.
+
+        column_case (str, optional): the case the column names are compared
+        in.
+
+        streaming (bool, optional): collect the profiles with the streaming
+        engine.
+
+    Returns:
+        PreflightData: the verdict and the profile of both tables.
+    """
+    setcase = SetCase(column_case)
+
+    columns_1 = get_lazyframe_column_names(p1)
+    columns_2 = get_lazyframe_column_names(p2)
+    shared_columns = get_formated_ordered_union(
+        columns_1, columns_2, formatter=setcase
+    )
+
+    p1 = p1.rename({c: setcase(c) for c in columns_1}).select(shared_columns)
+    p2 = p2.rename({c: setcase(c) for c in columns_2}).select(shared_columns)
+
+    ordered = (
+        column_indexes is None
+        or len(convert_iterable_to_list(column_indexes)) == 0
+    )
+
+    return run_preflight(p1, p2, ordered, "streaming" if streaming else "auto")
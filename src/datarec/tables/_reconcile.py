@@ -0,0 +1,241 @@
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Literal
+
+import polars as pl
+
+from ..utils.functions import get_lazyframe_column_names
+from ..data import TableReconciliationData
+from ._method_base import (
+    _ReconcilerMethodBase,
+    MaterializeOptions,
+    PreflightOptions,
+    ValidateIndexOptions,
+)
+from ._reconciler import Reconciler
+from ._is_equal import _is_equal
+from ._is_close_numeric import _is_close
+
+ComparatorOptions = Literal["exact", "tolerance", "window"]
+
+
+def _default_comparator(
+    left: pl.DataType, right: pl.DataType
+) -> ComparatorOptions:
+    if (
+        left.is_float()
+        or right.is_float()
+        or left == pl.Decimal
+        or right == pl.Decimal
+    ):
+        return "tolerance"
+    if all(d in (pl.Date, pl.Datetime, pl.Duration) for d in (left, right)):
+        return "window"
+    return "exact"
+
+
+def _is_within(left: pl.Expr, right: pl.Expr, window: timedelta) -> pl.Expr:
+    return (((left - right).abs() <= window) | left.eq(right)).fill_null(
+        pl.lit(False)
+    )
+
+
+class _ReconcilerMethodMixed(_ReconcilerMethodBase):
+    def validator(
+        self, test_columns: str, merged: pl.LazyFrame, **kwargs
+    ) -> pl.LazyFrame:
+        get_left = self.methods.get_left
+        get_right = self.methods.get_right
+        setcase = self.methods.setcase
+
+        options = {setcase(c): o for c, o in kwargs["column_options"].items()}
+        # the schema is resolved once for every column
+        schema = merged.collect_schema()
+
+        for c in options:
+            assert get_left(c) in schema, "cannot find column %s" % c
+
+        def compare(c: str) -> pl.Expr:
+            left = pl.col(get_left(c))
+            right = pl.col(get_right(c))
+            o = dict(kwargs, **options.get(c, {}))
+            comparator = o.get("comparator") or _default_comparator(
+                schema[get_left(c)], schema[get_right(c)]
+            )
+
+            assert comparator in [
+                "exact",
+                "tolerance",
+                "window",
+            ], "comparator is either exact, tolerance or window"
+
+            if comparator == "tolerance":
+                return _is_close(left, right, o["a_tol"], o["r_tol"])
+            if comparator == "window":
+                return _is_within(left, right, o["time_tol"])
+            return _is_equal(left, right)
+
+        validation = merged.with_columns(
+            [
+                compare(c).alias("%s ~*%s*~" % (c, setcase("validation")))
+                for c in test_columns
+            ]
+        )
+        return validation
+
+
+class _ReconcilerMethodMixedNoIndex(_ReconcilerMethodMixed):
+    def __call__(
+        self,
+        pl1: pl.LazyFrame,
+        pl2: pl.LazyFrame,
+        columns_to_ignore: List[int],
+        **kwargs
+    ) -> pl.LazyFrame:
+        test_columns = get_lazyframe_column_names(pl1)
+        return super().__call__(
+            pl1, pl2, test_columns, columns_to_ignore, **kwargs
+        )
+
+
+class _ReconcilerMethodMixedWithIndex(_ReconcilerMethodMixed):
+    def __call__(
+        self,
+        pl1: pl.LazyFrame,
+        pl2: pl.LazyFrame,
+        columns_to_ignore: List[int],
+        columns_as_indexes: List[str],
+        **kwargs
+    ) -> pl.LazyFrame:
+        columns = get_lazyframe_column_names(pl1)
+        index_columns = {columns[i] for i in columns_as_indexes}
+        test_columns = [c for c in columns if c not in index_columns]
+        return super().__call__(
+            pl1, pl2, test_columns, columns_to_ignore, **kwargs
+        )
+
+
+def reconcile(
+    p1: pl.LazyFrame,
+    p2: pl.LazyFrame,
+    pl1_name="left",
+    pl2_name="right",
+    interlaced: bool = True,
+    column_case: str = "upper",
+    show_both_first: bool = True,
+    show_failed_first: bool = True,
+    columns_to_ignore: Iterable[int] = None,
+    column_indexes: Iterable[int] = None,
+    materialize: MaterializeOptions = "join",
+    streaming: bool = False,
+    approximate: bool = False,
+    sample_fraction: float = 0.01,
+    validate_index: ValidateIndexOptions = "fast",
+    preflight: PreflightOptions = "off",
+    a_tol: float = 10e-3,
+    r_tol: float = 10e-4,
+    time_tol: timedelta = timedelta(0),
+    column_options: Dict[str, Dict[str, Any]] = None,
+) -> TableReconciliationData:
+    """Reconciles two tables choosing the comparison of every column from
+    its type, all the comparisons are validated over a single join.
+
+    - exact: strings, integers, booleans and every other type are equal, two
+      missing values are equal.
+    - tolerance: floats and decimals are compared as in is_close_numeric.
+    - window: dates, datetimes and durations are at most time_tol apart.
+
+    Args:
+        a_tol (float, optional): the absolute tolerance of the tolerance
+        comparison.
+
+        r_tol (float, optional): the relative tolerance of the tolerance
+        comparison.
+
+        time_tol (timedelta, optional): the width of the window comparison.
+
+        column_options (dict[str, dict], optional): per column overrides keyed
+        by column name. An override may set the comparator, as well as a_tol,
+        r_tol and time_tol for that column alone, for example
+        {"SUM_ENERGY": {"a_tol": 0.5}, "RUNNO": {"comparator": "tolerance"}}.
+
+        The remaining arguments are the ones of is_equal.
+
+    Returns:
+        TableReconciliationData: the reconciliation.
+    """
+    return Reconciler(
+        _ReconcilerMethodMixedNoIndex,
+        _ReconcilerMethodMixedWithIndex,
+    )(
+        p1,
+        p2,
+        pl1_name=pl1_name,
+        pl2_name=pl2_name,
+        interlaced=interlaced,
+        column_case=column_case,
+        show_both_first=show_both_first,
+        show_failed_first=show_failed_first,
+        columns_to_ignore=columns_to_ignore,
+        column_indexes=column_indexes,
+        materialize=materialize,
+        streaming=streaming,
+        approximate=approximate,
+        sample_fraction=sample_fraction,
+        validate_index=validate_index,
+        preflight=preflight,
+        a_tol=a_tol,
+        r_tol=r_tol,
+        time_tol=time_tol,
+        column_options=column_options or {},
+    )
+
+
+async def reconcile_async(
+    p1: pl.LazyFrame,
+    p2: pl.LazyFrame,
+    pl1_name="left",
+    pl2_name="right",
+    interlaced: bool = True,
+    column_case: str = "upper",
+    show_both_first: bool = True,
+    show_failed_first: bool = True,
+    columns_to_ignore: Iterable[int] = None,
+    column_indexes: Iterable[int] = None,
+    materialize: MaterializeOptions = "join",
+    streaming: bool = False,
+    approximate: bool = False,
+    sample_fraction: float = 0.01,
+    validate_index: ValidateIndexOptions = "fast",
+    preflight: PreflightOptions = "off",
+    a_tol: float = 10e-3,
+    r_tol: float = 10e-4,
+    time_tol: timedelta = timedelta(0),
+    column_options: Dict[str, Dict[str, Any]] = None,
+) -> TableReconciliationData:
+    """Awaitable counterpart of reconcile, the eager collections are awaited
+    with the polars async collection."""
+    return await Reconciler(
+        _ReconcilerMethodMixedNoIndex,
+        _ReconcilerMethodMixedWithIndex,
+    ).call_async(
+        p1,
+        p2,
+        pl1_name=pl1_name,
+        pl2_name=pl2_name,
+        interlaced=interlaced,
+        column_case=column_case,
+        show_both_first=show_both_first,
+        show_failed_first=show_failed_first,
+        columns_to_ignore=columns_to_ignore,
+        column_indexes=column_indexes,
+        materialize=materialize,
+        streaming=streaming,
+        approximate=approximate,
+        sample_fraction=sample_fraction,
+        validate_index=validate_index,
+        preflight=preflight,
+        a_tol=a_tol,
+        r_tol=r_tol,
+        time_tol=time_tol,
+        column_options=column_options or {},
+    )
@@ -1,14 +1,27 @@
 import typing as T
 
 import polars as pl
-from ..data import MethodData, TableReconciliationData
+from ..data import (
+    ColumnRoles,
+    MethodData,
+    PreflightData,
+    TableReconciliationData,
+)
 from ..utils import GetSuffixed, SetCase
+from ._method_base import (
+    MaterializeOptions,
+    PreflightOptions,
+    ValidateIndexOptions,
+)
+from ._preflight import run_preflight, run_preflight_async
 from ..utils.functions import (
     get_lazyframe_column_names,
     convert_iterable_to_list,
     get_formated_ordered_union,
     group_suffixed,
-    validate_index_columns,
+    hash_columns,
+    validate_indexes,
+    validate_indexes_async,
 )
 
 try:
@@ -26,6 +39,135 @@ class Reconciler:
         self.NoIndexConstructor = NoIndexConstructor
         self.WithIndexConstructor = WithIndexConstructor
 
+    def _prepare(
+        self,
+        pl1: pl.LazyFrame,
+        pl2: pl.LazyFrame,
+        setcase: SetCase,
+        column_indexes: T.List[int],
+        sample_fraction: float,
+    ) -> T.Tuple[pl.LazyFrame, pl.LazyFrame, T.List[str]]:
+        """Selects the columns shared by both tables in a common case, and
+        samples their keys when sample_fraction is below one."""
+        # the schemas are resolved once, every column lookup below is a set or
+        # dict lookup so planning stays linear in the number of columns
+        columns_1 = get_lazyframe_column_names(pl1)
+        columns_2 = get_lazyframe_column_names(pl2)
+
+        shared_columns = get_formated_ordered_union(
+            columns_1, columns_2, formatter=setcase
+        )
+
+        pl1 = pl1.rename({c: setcase(c) for c in columns_1})
+        pl2 = pl2.rename({c: setcase(c) for c in columns_2})
+
+        pl1 = pl1.select([pl.col(c) for c in shared_columns])
+        pl2 = pl2.select([pl.col(c) for c in shared_columns])
+
+        columns_used_as_indexes = [shared_columns[i] for i in column_indexes]
+
+        if sample_fraction < 1:
+            # both tables keep the rows whose key hashes below the same
+            # threshold, so the same keys are sampled on each side
+            if len(columns_used_as_indexes) > 0:
+                # the hash depends on the types, keys of different types which
+                # join, such as Int32 and Int64, are hashed in their supertype
+                supertypes = pl.concat(
+                    [
+                        pl1.select(columns_used_as_indexes).clear(),
+                        pl2.select(columns_used_as_indexes).clear(),
+                    ],
+                    how="vertical_relaxed",
+                ).collect_schema()
+                key_hash = hash_columns(
+                    columns_used_as_indexes, dict(supertypes)
+                )
+            else:
+                key_hash = pl.int_range(pl.len(), dtype=pl.UInt64).hash()
+            threshold = pl.lit(
+                min(int(sample_fraction * 2**64), 2**64 - 1),
+                dtype=pl.UInt64,
+            )
+            pl1 = pl1.filter(key_hash < threshold)
+            pl2 = pl2.filter(key_hash < threshold)
+
+        return pl1, pl2, shared_columns
+
+    async def call_async(
+        self,
+        pl1: pl.LazyFrame,
+        pl2: pl.LazyFrame,
+        column_case: str = "upper",
+        column_indexes: T.Iterable = None,
+        materialize: MaterializeOptions = "join",
+        streaming: bool = False,
+        approximate: bool = False,
+        sample_fraction: float = 0.01,
+        validate_index: ValidateIndexOptions = "fast",
+        preflight: PreflightOptions = "off",
+        **kwargs
+    ) -> TableReconciliationData:
+        """Awaitable counterpart of __call__. The index checks, the preflight
+        checks and, when materialize is join, the results are collected with
+        the polars async collection so the event loop is not blocked. The
+        other materialize options leave the results lazy.
+        """
+        if column_indexes is None:
+            column_indexes = []
+
+        column_indexes = convert_iterable_to_list(column_indexes)
+        engine = "streaming" if streaming else "auto"
+
+        validate = len(column_indexes) > 0 and validate_index != "off"
+        preflight_data = None
+
+        if validate or preflight != "off":
+            pl1_prepared, pl2_prepared, _ = self._prepare(
+                pl1,
+                pl2,
+                SetCase(column_case),
+                column_indexes,
+                sample_fraction if approximate else 1.0,
+            )
+
+        if validate:
+            await validate_indexes_async(
+                {"left": pl1_prepared, "right": pl2_prepared},
+                column_indexes,
+                validate_index,
+                engine,
+            )
+
+        if preflight != "off":
+            preflight_data = await run_preflight_async(
+                pl1_prepared,
+                pl2_prepared,
+                len(column_indexes) == 0,
+                engine,
+            )
+
+        reconciliation = self(
+            pl1,
+            pl2,
+            column_case=column_case,
+            column_indexes=column_indexes,
+            materialize="never" if materialize == "join" else materialize,
+            streaming=streaming,
+            approximate=approximate,
+            sample_fraction=sample_fraction,
+            validate_index="off",
+            preflight=preflight,
+            preflight_data=preflight_data,
+            **kwargs
+        )
+
+        if materialize == "join" and not streaming:
+            results = await reconciliation.results.collect_async()
+            reconciliation.results = results.lazy()
+            reconciliation.unsorted_results = None
+
+        return reconciliation
+
     def __call__(
         self,
         pl1: pl.LazyFrame,
@@ -38,9 +180,53 @@ class Reconciler:
         show_failed_first: bool = True,
         columns_to_ignore: T.Iterable = None,
         column_indexes: T.Iterable = None,
+        materialize: MaterializeOptions = "join",
+        streaming: bool = False,
+        approximate: bool = False,
+        sample_fraction: float = 0.01,
+        validate_index: ValidateIndexOptions = "fast",
+        preflight: PreflightOptions = "off",
+        preflight_data: T.Optional[PreflightData] = None,
         **kwargs
     ) -> TableReconciliationData:
+        """Reconciles two tables.
+
+        preflight_data is a preflight which was already computed, by
+        call_async, and is used instead of running the checks again.
+        """
         assert pl1_name != pl2_name, "tables names must be different"
+        assert materialize in [
+            "never",
+            "join",
+            "auto",
+        ], "materialize is either never, join or auto"
+        assert validate_index in [
+            "fast",
+            "full",
+            "off",
+        ], "validate_index is either fast, full or off"
+        assert preflight in [
+            "off",
+            "check",
+            "skip",
+            "stop",
+        ], "preflight is either off, check, skip or stop"
+
+        # the streaming engine executes the whole plan out of core, so the
+        # join is never collected and the global sorts are skipped
+        if streaming:
+            materialize = "never"
+            show_both_first = False
+            show_failed_first = False
+
+        engine = "streaming" if streaming else "auto"
+
+        if approximate:
+            assert (
+                0 < sample_fraction <= 1
+            ), "sample_fraction must be in the interval (0, 1]"
+        else:
+            sample_fraction = 1.0
 
         setcase = SetCase(column_case)
         get_left = GetSuffixed(setcase, pl1_name)
@@ -57,67 +243,88 @@ class Reconciler:
 
         columns_to_ignore = convert_iterable_to_list(columns_to_ignore)
 
-        shared_columns = get_formated_ordered_union(
-            get_lazyframe_column_names(pl1),
-            get_lazyframe_column_names(pl2),
-            formatter=setcase,
-        )
-
-        pl1 = pl1.rename(
-            {c: setcase(c) for c in get_lazyframe_column_names(pl1)}
-        )
-        pl2 = pl2.rename(
-            {c: setcase(c) for c in get_lazyframe_column_names(pl2)}
+        pl1, pl2, shared_columns = self._prepare(
+            pl1, pl2, setcase, column_indexes, sample_fraction
         )
 
-        pl1 = pl1.select([pl.col(c) for c in shared_columns])
-        pl2 = pl2.select([pl.col(c) for c in shared_columns])
-
-        _all_columns = get_lazyframe_column_names(pl1)
+        _all_columns = list(shared_columns)
         _columns_used_as_indexes = [shared_columns[i] for i in column_indexes]
-        _columns_tested = [
-            c for c in _all_columns if c not in _columns_used_as_indexes
-        ]
+
+        _indexes = set(_columns_used_as_indexes)
+        _columns_tested = [c for c in _all_columns if c not in _indexes]
         _columns_ignored = [_columns_tested[i] for i in columns_to_ignore]
-        _index_and_tested = _columns_used_as_indexes + _columns_ignored
+        _index_and_tested = _indexes.union(_columns_ignored)
         _tested_columns = [
             c for c in _all_columns if c not in _index_and_tested
         ]
 
+        if len(column_indexes) > 0 and validate_index != "off":
+            # both sides are checked concurrently in a single pass
+            validate_indexes(
+                {"left": pl1, "right": pl2},
+                column_indexes,
+                validate_index,
+                engine,
+            )
+
+        if preflight != "off" and preflight_data is None:
+            preflight_data = run_preflight(
+                pl1, pl2, len(column_indexes) == 0, engine
+            )
+
+        # a failing preflight proves the tables do not reconcile, the row join
+        # is not run when asked to stop
+        if preflight == "stop":
+            assert preflight_data.verdict != "fail", (
+                "the preflight failed. there are %d rows in the left table, "
+                "%d rows in the right table and the columns %s have "
+                "mismatched types"
+                % (
+                    preflight_data.n_rows_left,
+                    preflight_data.n_rows_right,
+                    preflight_data.columns_mismatched,
+                )
+            )
+
+        # a passing preflight proves both tables hold the same rows
+        identical = (
+            preflight in ["skip", "stop"] and preflight_data.verdict == "pass"
+        )
+
         if len(column_indexes) == 0:
-            compare_no_index = self.NoIndexConstructor(methods)
+            compare_no_index = self.NoIndexConstructor(
+                methods, materialize, identical
+            )
             validation = compare_no_index(
                 pl1, pl2, columns_to_ignore, **kwargs
             )
         else:
-            compare_with_index = self.WithIndexConstructor(methods)
-            validate_index_columns(pl1.clone(), column_indexes, "left")
-            validate_index_columns(pl2.clone(), column_indexes, "right")
-
+            compare_with_index = self.WithIndexConstructor(
+                methods, materialize, identical
+            )
             validation = compare_with_index(
                 pl1, pl2, columns_to_ignore, column_indexes, **kwargs
             )
 
+        columns = get_lazyframe_column_names(validation)
+
         if interlaced:
-            sorted_columns = group_suffixed(
-                get_lazyframe_column_names(validation)
-            )
+            columns = group_suffixed(columns)
+            validation = validation.select([pl.col(c) for c in columns])
+
+        roles = ColumnRoles.from_columns(
+            columns, setcase(pl1_name), setcase(pl2_name)
+        )
 
-            validation = validation.select([pl.col(c) for c in sorted_columns])
+        unsorted = validation
 
         if show_failed_first:
-            validation_columns = filter(
-                lambda x: setcase("~*validation*~") in x,
-                get_lazyframe_column_names(validation),
-            )
-            validation = validation.sort(by=validation_columns)
+            validation = validation.sort(by=list(roles.validation))
 
         if show_both_first:
-            validation = validation.sort(
-                by=setcase("**both**"), descending=True
-            )
+            validation = validation.sort(by=roles.is_both, descending=True)
 
-        return TableReconciliationData(
+        reconciliation = TableReconciliationData(
             validation,
             setcase(pl1_name),
             setcase(pl2_name),
@@ -125,4 +332,16 @@ class Reconciler:
             _columns_used_as_indexes,
             _columns_ignored,
             _tested_columns,
+            streaming,
+            sample_fraction,
+            unsorted,
+            roles,
+            preflight_data,
         )
+
+        # a single use runs the lazy plan, repeated accessors and summaries
+        # reuse the results materialized by the second one
+        if materialize == "auto":
+            reconciliation.memoize(after=1)
+
+        return reconciliation
@@ -1,136 +1,338 @@
-from typing import Literal
-import numpy as np
-from numpy import typing as np_types
+import math
+import asyncio
+from statistics import NormalDist
+from typing import Dict, List, Literal, Optional, Tuple
 import polars as pl
 from ..utils.functions import get_lazyframe_column_names
 from ..data import (
+    ColumnRoles,
     TableReconciliationData,
     TableReconciliationSummarizationData,
 )
 
+_moment_columns = [
+    "n_rows",
+    "n_entries_passed",
+    "n_rows_passed",
+    "n_rows_passed_partially",
+    "n_invalidations",
+    "n_invalidations_squared",
+]
+
+_moments_schema = dict(
+    left=pl.Boolean,
+    right=pl.Boolean,
+    **{c: pl.Int64 for c in _moment_columns},
+    n_tested_cols=pl.Int64,
+)
 
-def _get_validations(lf: pl.LazyFrame) -> pl.LazyFrame:
-    validation_columns = [
-        c
-        for c in get_lazyframe_column_names(lf)
-        if "~*validation*~" in c.lower()
-    ]
-    return lf.select([pl.col(c) for c in validation_columns])
 
+_passed_template = "%s ~n_passed~"
+_null_template = "%s ~n_null~"
 
-def _make_2d(arr: np_types.NDArray) -> np_types.NDArray:
-    if len(arr.shape) < 2:
-        return arr.reshape(-1, 1)
-    return arr
 
+def _moments_frame(rows: List[dict]) -> pl.DataFrame:
+    """Rebuilds stored moments, the per column moments are inferred."""
+    if len(rows) == 0:
+        return pl.DataFrame(schema=_moments_schema)
+    return pl.DataFrame(
+        rows, schema_overrides=_moments_schema, infer_schema_length=None
+    )
 
-def _summarizer(arr: np_types.DTypeLike):
-    rows, cols = arr.shape
-    n_entries = rows * cols
-    arr[arr == None] = False
-    n_entries_passed = arr.sum()
-    n_entries_failed = n_entries - n_entries_passed
-
-    n_rows_passed = (arr.sum(axis=1) == cols).sum()
-    n_rows_partially_passed = (
-        np.logical_and((arr.sum(axis=1) > 0), (arr.sum(axis=1) != cols))
-    ).sum()
-
-    if len(arr) > 0:
-        avg_row_invalidations = (arr == 0).sum(1).mean()
-        std_row_invalidations = (arr == 0).sum(1).std()
-    else:
-        avg_row_invalidations = 0
-        std_row_invalidations = 0
 
-    n_rows_failed = rows - n_rows_passed - n_rows_partially_passed
+def _column_breakdown(view: pl.DataFrame) -> pl.DataFrame:
+    """Passed, failed and null entry counts of every tested column."""
+    suffix = _passed_template % ""
+    columns = [c[: -len(suffix)] for c in view.columns if c.endswith(suffix)]
+    rows = int(view["n_rows"].sum())
+
+    breakdown = []
+    for column in columns:
+        passed = int(view[_passed_template % column].sum())
+        null = None
+        if _null_template % column in view.columns:
+            null = int(view[_null_template % column].sum())
+        breakdown.append(
+            dict(
+                column=column,
+                n_passed=passed,
+                n_failed=rows - passed,
+                n_null=null,
+                failure_ratio=(rows - passed) / rows if rows > 0 else 0.0,
+            )
+        )
+
+    return pl.DataFrame(
+        breakdown,
+        schema=dict(
+            column=pl.String,
+            n_passed=pl.Int64,
+            n_failed=pl.Int64,
+            n_null=pl.Int64,
+            failure_ratio=pl.Float64,
+        ),
+    )
 
-    try:
-        entry_validation_ratio = n_entries_passed / n_entries
-    except ZeroDivisionError:
-        entry_validation_ratio = 0
 
-    try:
-        row_validation_ratio = n_rows_passed / rows
-    except ZeroDivisionError:
-        row_validation_ratio = 0
+def _moments_query(
+    lf: pl.LazyFrame,
+    by: Optional[List[str]] = None,
+    roles: Optional[ColumnRoles] = None,
+) -> pl.LazyFrame:
+    """Builds a lazy aggregation of additive validation moments grouped by the
+    left and right location columns, and optionally by extra columns.
+
+    Every summary join method is a union of the (left, right) groups, so the
+    moments of a single scan are enough to summarize all of them. The moments
+    are plain sums, partial moments can therefore be added together.
+    """
+    if by is None:
+        by = []
+
+    if roles is None:
+        roles = ColumnRoles.from_columns(get_lazyframe_column_names(lf))
+
+    validation_columns = roles.validation
+    left_col = roles.is_left
+    right_col = roles.is_right
+
+    n_cols = len(validation_columns)
+
+    # the per column counts are plain sums as well, they are computed in the
+    # same aggregation as the totals
+    per_column = []
+    for column, (left, right, validation) in roles.tested.items():
+        per_column.append(
+            pl.col(validation)
+            .fill_null(False)
+            .cast(pl.Int64)
+            .sum()
+            .alias(_passed_template % column)
+        )
+        if left is not None and right is not None:
+            per_column.append(
+                (pl.col(left).is_null() ^ pl.col(right).is_null())
+                .cast(pl.Int64)
+                .sum()
+                .alias(_null_template % column)
+            )
+
+    if n_cols > 0:
+        n_passed = pl.sum_horizontal(
+            [
+                pl.col(c).fill_null(False).cast(pl.Int64)
+                for c in validation_columns
+            ]
+        )
+    else:
+        n_passed = pl.col(left_col).cast(pl.Int64) * 0
+
+    n_failed = n_cols - n_passed
 
     return (
-        int(rows),
-        int(cols),
-        int(n_entries),
-        int(n_entries_passed),
-        int(n_entries_failed),
-        int(n_rows_passed),
-        int(n_rows_partially_passed),
-        int(n_rows_failed),
-        float(entry_validation_ratio),
-        float(row_validation_ratio),
-        float(avg_row_invalidations),
-        float(std_row_invalidations),
+        lf.group_by(
+            [pl.col(c) for c in by]
+            + [
+                pl.col(left_col).alias("left"),
+                pl.col(right_col).alias("right"),
+            ]
+        )
+        .agg(
+            pl.len().cast(pl.Int64).alias("n_rows"),
+            n_passed.sum().alias("n_entries_passed"),
+            (n_passed == n_cols).sum().cast(pl.Int64).alias("n_rows_passed"),
+            ((n_passed > 0) & (n_passed != n_cols))
+            .sum()
+            .cast(pl.Int64)
+            .alias("n_rows_passed_partially"),
+            n_failed.sum().alias("n_invalidations"),
+            (n_failed * n_failed).sum().alias("n_invalidations_squared"),
+            *per_column,
+        )
+        .with_columns(pl.lit(n_cols, dtype=pl.Int64).alias("n_tested_cols"))
     )
 
 
-def _get_totals(lf: pl.LazyFrame):
-    left_col = [
-        c for c in get_lazyframe_column_names(lf) if "**left**" in c.lower()
-    ][0]
-    right_col = [
-        c for c in get_lazyframe_column_names(lf) if "**right**" in c.lower()
-    ][0]
-    intersecting_col = [
-        c for c in get_lazyframe_column_names(lf) if "**both**" in c.lower()
-    ][0]
-    n_total_rows_left = lf.select(left_col).collect().to_numpy().sum()
-    n_total_rows_right = lf.select(right_col).collect().to_numpy().sum()
-    n_total_rows_intersection = (
-        lf.select(intersecting_col).collect().to_numpy().sum()
+def _in_view(moments: pl.DataFrame, join: str) -> pl.DataFrame:
+    if join == "left":
+        return moments.filter(pl.col("left"))
+    if join == "right":
+        return moments.filter(pl.col("right"))
+    if join == "inner":
+        return moments.filter(pl.col("left") & pl.col("right"))
+    return moments
+
+
+def _wilson_interval(
+    successes: int, n: int, z: float, fpc: float
+) -> Tuple[float, float]:
+    if n == 0:
+        return (0.0, 1.0)
+    p = successes / n
+    z2 = z * z * fpc
+    centre = (p + z2 / (2 * n)) / (1 + z2 / n)
+    half = (math.sqrt(z2) * math.sqrt(p * (1 - p) / n + z2 / (4 * n * n))) / (
+        1 + z2 / n
     )
-    n_total_rows_union = len(lf.select(left_col).collect())
+    return (max(0.0, centre - half), min(1.0, centre + half))
+
+
+def _confidence_intervals(
+    summary: TableReconciliationSummarizationData,
+    sample_fraction: float,
+    confidence: float,
+) -> Dict[str, Tuple[float, float]]:
+    """Confidence intervals of the validation ratios of a key sample.
+
+    The row ratio uses a Wilson score interval. Entries within a row are not
+    independent, the entry ratio is the mean of the per-row pass fractions,
+    its standard error comes from the per-row invalidation deviation. Both
+    apply the finite population correction of the sample fraction.
+    """
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    fpc = 1 - sample_fraction
+    n = summary.n_tested_rows
+    cols = summary.n_tested_cols
+
+    if n > 0 and cols > 0:
+        p = summary.validation_ratio_entries
+        half = (
+            z
+            * summary.stats_invalidations_per_row_std
+            / cols
+            * math.sqrt(fpc / n)
+        )
+        entries = (max(0.0, p - half), min(1.0, p + half))
+    else:
+        entries = (0.0, 1.0)
 
-    return (
-        int(n_total_rows_left),
-        int(n_total_rows_right),
-        int(n_total_rows_intersection),
-        int(n_total_rows_union),
+    return dict(
+        validation_ratio_entries=entries,
+        validation_ratio_rows=_wilson_interval(
+            summary.n_tested_rows_passed, n, z, fpc
+        ),
     )
 
 
+def _summary_from_moments(
+    moments: pl.DataFrame,
+    join: Literal["left", "right", "inner", "outer"] = "outer",
+    sample_fraction: float = 1.0,
+    confidence: float = 0.95,
+) -> TableReconciliationSummarizationData:
+    if len(moments) > 0:
+        cols = int(moments["n_tested_cols"][0])
+    else:
+        cols = 0
+
+    view = _in_view(moments, join)
+    totals = {c: int(view[c].sum()) for c in _moment_columns}
+
+    rows = totals["n_rows"]
+    n_entries = rows * cols
+    n_entries_passed = totals["n_entries_passed"]
+    n_rows_passed = totals["n_rows_passed"]
+    n_rows_partially_passed = totals["n_rows_passed_partially"]
+
+    if rows > 0:
+        avg_row_invalidations = totals["n_invalidations"] / rows
+        # population variance from the integer moments, exact until the
+        # final division
+        variance = (
+            rows * totals["n_invalidations_squared"]
+            - totals["n_invalidations"] ** 2
+        ) / rows**2
+        std_row_invalidations = math.sqrt(max(variance, 0))
+    else:
+        avg_row_invalidations = 0.0
+        std_row_invalidations = 0.0
+
+    summary = TableReconciliationSummarizationData(
+        rows,
+        cols,
+        n_entries,
+        n_entries_passed,
+        n_entries - n_entries_passed,
+        n_rows_passed,
+        n_rows_partially_passed,
+        rows - n_rows_passed - n_rows_partially_passed,
+        n_entries_passed / n_entries if n_entries > 0 else 0.0,
+        n_rows_passed / rows if rows > 0 else 0.0,
+        float(avg_row_invalidations),
+        float(std_row_invalidations),
+        int(_in_view(moments, "left")["n_rows"].sum()),
+        int(_in_view(moments, "right")["n_rows"].sum()),
+        int(_in_view(moments, "inner")["n_rows"].sum()),
+        int(moments["n_rows"].sum()),
+        column_breakdown=_column_breakdown(view),
+    )
+
+    if sample_fraction < 1:
+        summary.sample_fraction = sample_fraction
+        summary.confidence_level = confidence
+        summary.confidence_intervals = _confidence_intervals(
+            summary, sample_fraction, confidence
+        )
+
+    return summary
+
+
+def _summarize_all_from_moments(
+    moments: pl.DataFrame,
+    sample_fraction: float = 1.0,
+    confidence: float = 0.95,
+) -> Dict[str, TableReconciliationSummarizationData]:
+    return {
+        join: _summary_from_moments(moments, join, sample_fraction, confidence)
+        for join in joins
+    }
+
+
+def _engine(reconciliation: TableReconciliationData) -> str:
+    return "streaming" if reconciliation.streaming else "auto"
+
+
 def _shared_summarize(
-    lf: pl.LazyFrame, filter_col: str
-) -> TableReconciliationData:
-    lf_original = lf
-    if filter_col is not None:
-        lf = lf.filter(pl.col(filter_col))
-    arr = _make_2d(_get_validations(lf).collect().to_numpy())
-    return TableReconciliationSummarizationData(
-        *_summarizer(arr), *_get_totals(lf_original)
+    lf: pl.LazyFrame,
+    join: Literal["left", "right", "inner", "outer"],
+    roles: Optional[ColumnRoles] = None,
+    engine: str = "auto",
+) -> TableReconciliationSummarizationData:
+    return _summary_from_moments(
+        _moments_query(lf, roles=roles).collect(engine=engine), join
     )
 
 
-def _left_summarize(lf: pl.LazyFrame) -> TableReconciliationSummarizationData:
-    filter_col = [
-        c for c in get_lazyframe_column_names(lf) if "**left**" in c.lower()
-    ][0]
-    return _shared_summarize(lf, filter_col)
+def _left_summarize(
+    lf: pl.LazyFrame,
+    roles: Optional[ColumnRoles] = None,
+    engine: str = "auto",
+) -> TableReconciliationSummarizationData:
+    return _shared_summarize(lf, "left", roles, engine)
 
 
-def _right_summarize(lf: pl.LazyFrame) -> TableReconciliationSummarizationData:
-    filter_col = [
-        c for c in get_lazyframe_column_names(lf) if "**right**" in c.lower()
-    ][0]
-    return _shared_summarize(lf, filter_col)
+def _right_summarize(
+    lf: pl.LazyFrame,
+    roles: Optional[ColumnRoles] = None,
+    engine: str = "auto",
+) -> TableReconciliationSummarizationData:
+    return _shared_summarize(lf, "right", roles, engine)
 
 
-def _inner_summarize(lf: pl.LazyFrame) -> TableReconciliationSummarizationData:
-    filter_col = [
-        c for c in get_lazyframe_column_names(lf) if "**both**" in c.lower()
-    ][0]
-    return _shared_summarize(lf, filter_col)
+def _inner_summarize(
+    lf: pl.LazyFrame,
+    roles: Optional[ColumnRoles] = None,
+    engine: str = "auto",
+) -> TableReconciliationSummarizationData:
+    return _shared_summarize(lf, "inner", roles, engine)
 
 
-def _outer_summarize(lf: pl.LazyFrame) -> TableReconciliationSummarizationData:
-    return _shared_summarize(lf, None)
+def _outer_summarize(
+    lf: pl.LazyFrame,
+    roles: Optional[ColumnRoles] = None,
+    engine: str = "auto",
+) -> TableReconciliationSummarizationData:
+    return _shared_summarize(lf, "outer", roles, engine)
 
 
 summarizer_map = {
@@ -140,26 +342,73 @@ summarizer_map = {
     "outer": _outer_summarize,
 }
 
+joins = list(summarizer_map.keys())
+
 
 def summarize_reconciliation(
     reconciliation: TableReconciliationData,
     join: Literal["left", "right", "inner", "outer"] = "outer",
+    confidence: float = 0.95,
 ) -> TableReconciliationSummarizationData:
-    results = reconciliation.results
-    column_indexes = reconciliation.columns_indexes
-    columns_ignored = reconciliation.columns_ignored
+    # only the validation and location columns are referenced by the summary
+    # query, projection pushdown drops every other column from the scan
+    if reconciliation.sample_fraction >= 1:
+        return summarizer_map[join](
+            reconciliation.get_results_union(),
+            reconciliation.roles,
+            _engine(reconciliation),
+        )
+
+    moments = _moments_query(
+        reconciliation.get_results_union(), roles=reconciliation.roles
+    ).collect(engine=_engine(reconciliation))
+    return _summary_from_moments(
+        moments, join, reconciliation.sample_fraction, confidence
+    )
 
-    # columns to process
-    processable_columns = [
-        pl.col(c)
-        for c in get_lazyframe_column_names(results)
-        if all([c not in t for t in (columns_ignored + column_indexes)])
-    ]
 
-    # grab the validations
-    processable_table = results.select(processable_columns)
+async def summarize_reconciliation_async(
+    reconciliation: TableReconciliationData,
+    join: Literal["left", "right", "inner", "outer"] = "outer",
+    confidence: float = 0.95,
+) -> TableReconciliationSummarizationData:
+    """Awaitable counterpart of summarize_reconciliation, the summary moments
+    are collected with collect_async so the event loop is not blocked.
+    Memoized results are materialized in the default executor for the same
+    reason.
+    """
+    results = await asyncio.get_running_loop().run_in_executor(
+        None, reconciliation.get_results_union
+    )
+    moments = await _moments_query(
+        results, roles=reconciliation.roles
+    ).collect_async(engine=_engine(reconciliation))
+    return _summary_from_moments(
+        moments, join, reconciliation.sample_fraction, confidence
+    )
 
-    # summarizer method
-    summarizer_method = summarizer_map[join]
 
-    return summarizer_method(processable_table)
+def summarize_all(
+    reconciliation: TableReconciliationData,
+    confidence: float = 0.95,
+) -> Dict[str, TableReconciliationSummarizationData]:
+    """Summarizes the reconciliation for every join method from a single
+    grouped aggregation over the results.
+
+    Args:
+        reconciliation (TableReconciliationData): the reconciliation to
+        summarize.
+
+        confidence (float, optional): the confidence level of the ratio
+        intervals of approximate reconciliations.
+
+    Returns:
+        dict[str, TableReconciliationSummarizationData]: the summaries keyed by
+        the join methods left, right, inner and outer.
+    """
+    moments = _moments_query(
+        reconciliation.get_results_union(), roles=reconciliation.roles
+    ).collect(engine=_engine(reconciliation))
+    return _summarize_all_from_moments(
+        moments, reconciliation.sample_fraction, confidence
+    )
@@ -1,6 +1,6 @@
 import re
 import polars as pl
-from typing import Iterable, Callable, Tuple, List
+from typing import Iterable, Callable, Dict, Literal, Optional, Tuple, List
 from collections import OrderedDict
 
 
@@ -30,20 +30,12 @@ def get_prefixes(suffixed_iterable: Iterable[str], regex: str) -> List[str]:
         of strings.
     """
 
-    found = set()
+    pattern = re.compile(regex)
 
-    def set_found(x):
-        prefix = re.sub(regex, "", x)
-        found.add(prefix)
-        return prefix
+    # dict keys keep their first insertion order
+    prefixes = {pattern.sub("", x): None for x in suffixed_iterable}
 
-    base_columns = [
-        set_found(x)
-        for x in suffixed_iterable
-        if re.sub(regex, "", x) not in found
-    ]
-
-    return base_columns
+    return list(prefixes)
 
 
 def group_suffixed(
@@ -63,17 +55,14 @@ def group_suffixed(
         by their prefixes.
     """
 
-    base_columns = get_prefixes(suffixed_iterable, regex)
+    pattern = re.compile(regex)
 
+    # every column is parsed once, the groups keep the order in which their
+    # prefixes first appear
     grouped_column_names = OrderedDict()
 
-    for key in base_columns:
-        grouped_column_names[key] = []
-
-    base_suffix_map = {c: re.sub(regex, "", c) for c in suffixed_iterable}
-
-    for new, original in base_suffix_map.items():
-        grouped_column_names[original].append(new)
+    for c in suffixed_iterable:
+        grouped_column_names.setdefault(pattern.sub("", c), []).append(c)
 
     sorted_columns = []
 
@@ -123,10 +112,13 @@ def get_formated_ordered_union(
     return get_ordered_union(iter_1, iter_2)
 
 
-def validate_index_columns(
-    df: pl.LazyFrame, index_of_columns: Iterable[int], title: str
-) -> Tuple[int, int]:
-    """Validates that the given columns in a DataFrame are unique.
+def index_uniqueness_query(
+    df: pl.LazyFrame,
+    index_of_columns: Iterable[int],
+    validate_index: Literal["fast", "full"] = "full",
+) -> pl.LazyFrame:
+    """Builds a single row query counting the unique index values of a
+    DataFrame.
 
     Args:
         df (pl.LazyFrame): A polars DataFrame to validate the columns of.
@@ -134,34 +126,148 @@ def validate_index_columns(
         index_of_columns (Iterable): An iterable of indices of columns in the
         DataFrame to validate.
 
-        title (str): A string title of the DataFrame being validated.
+        validate_index (str, optional): "fast" compares the number of unique
+        index values to the number of rows, "full" groups the index values and
+        counts the groups which appear once.
 
     Returns:
-        Tuple[int, int]: A tuple of integers with the number of unique columns
-        and total number of rows in the DataFrame.
+        pl.LazyFrame: a query with the n_unique and n_rows columns.
     """
+    assert validate_index in [
+        "fast",
+        "full",
+    ], "validate_index is either fast or full"
 
     columns = [get_lazyframe_column_names(df)[c] for c in index_of_columns]
 
-    repetitions_columns = (
-        df.select([pl.col(c) for c in columns])
-        .group_by([pl.col(c) for c in columns])
+    if validate_index == "fast":
+        return df.select(
+            pl.struct(columns).n_unique().cast(pl.Int64).alias("n_unique"),
+            pl.len().cast(pl.Int64).alias("n_rows"),
+        )
+
+    return (
+        df.group_by(columns)
         .agg(pl.len().alias("group_repetitions"))
-        .with_columns(
-            pl.col("group_repetitions").map_batches(lambda x: x == 1)
+        .select(
+            (pl.col("group_repetitions") == 1)
+            .sum()
+            .cast(pl.Int64)
+            .alias("n_unique"),
+            pl.len().cast(pl.Int64).alias("n_rows"),
         )
-        .select("group_repetitions")
-    ).collect()
+    )
+
 
-    n_unique = repetitions_columns.sum().to_numpy().squeeze()
-    n_rows = len(repetitions_columns)
+def validate_indexes(
+    dfs: Dict[str, pl.LazyFrame],
+    index_of_columns: Iterable[int],
+    validate_index: Literal["fast", "full"] = "full",
+    engine: str = "auto",
+) -> Dict[str, Tuple[int, int]]:
+    """Validates that the given columns are unique in each of the DataFrames,
+    the checks of every DataFrame run concurrently in a single collect_all.
+
+    Args:
+        dfs (dict): The polars DataFrames to validate keyed by their titles.
+
+        index_of_columns (Iterable): An iterable of indices of columns in the
+        DataFrames to validate.
 
-    assert (
-        n_unique == n_rows
-    ), f"indexes must be unique. there are {n_unique} \
+        validate_index (str, optional): Either "fast" or "full", see
+        index_uniqueness_query.
+
+        engine (str, optional): The polars engine used to run the checks.
+        Defaults to "auto".
+
+    Returns:
+        dict[str, Tuple[int, int]]: the number of unique index values and the
+        total number of rows keyed by the DataFrame titles.
+    """
+    index_of_columns = list(index_of_columns)
+    titles = list(dfs.keys())
+
+    counts = pl.collect_all(
+        [
+            index_uniqueness_query(dfs[t], index_of_columns, validate_index)
+            for t in titles
+        ],
+        engine=engine,
+    )
+
+    return _check_index_counts(titles, counts)
+
+
+async def validate_indexes_async(
+    dfs: Dict[str, pl.LazyFrame],
+    index_of_columns: Iterable[int],
+    validate_index: Literal["fast", "full"] = "full",
+    engine: str = "auto",
+) -> Dict[str, Tuple[int, int]]:
+    """Awaitable counterpart of validate_indexes, the checks are collected
+    with collect_all_async so the event loop is not blocked.
+    """
+    index_of_columns = list(index_of_columns)
+    titles = list(dfs.keys())
+
+    counts = await pl.collect_all_async(
+        [
+            index_uniqueness_query(dfs[t], index_of_columns, validate_index)
+            for t in titles
+        ],
+        engine=engine,
+    )
+
+    return _check_index_counts(titles, counts)
+
+
+def _check_index_counts(
+    titles: List[str], counts: List[pl.DataFrame]
+) -> Dict[str, Tuple[int, int]]:
+    validated = {}
+    for title, count in zip(titles, counts):
+        n_unique, n_rows = count.row(0)
+
+        assert (
+            n_unique == n_rows
+        ), f"indexes must be unique. there are {n_unique} \
             unique columns out of a total {n_rows} for the {title} df"
 
-    return n_unique, n_rows
+        validated[title] = (n_unique, n_rows)
+
+    return validated
+
+
+def validate_index_columns(
+    df: pl.LazyFrame,
+    index_of_columns: Iterable[int],
+    title: str,
+    engine: str = "auto",
+    validate_index: Literal["fast", "full"] = "full",
+) -> Tuple[int, int]:
+    """Validates that the given columns in a DataFrame are unique.
+
+    Args:
+        df (pl.LazyFrame): A polars DataFrame to validate the columns of.
+
+        index_of_columns (Iterable): An iterable of indices of columns in the
+        DataFrame to validate.
+
+        title (str): A string title of the DataFrame being validated.
+
+        engine (str, optional): The polars engine used to run the check.
+        Defaults to "auto".
+
+        validate_index (str, optional): Either "fast" or "full", see
+        index_uniqueness_query.
+
+    Returns:
+        Tuple[int, int]: A tuple of integers with the number of unique columns
+        and total number of rows in the DataFrame.
+    """
+    return validate_indexes(
+        {title: df}, index_of_columns, validate_index, engine
+    )[title]
 
 
 def filter_iterable(_l: Iterable[object], c: Iterable[object]) -> List[str]:
@@ -198,3 +304,62 @@ def convert_iterable_to_list(iterable: Iterable[object]) -> List[object]:
     else:
         iterable = list([iterable])
     return iterable
+
+
+def get_streaming_chunk_size(schema: pl.Schema, memory_budget: int) -> int:
+    """Estimates the number of rows per streaming chunk that keeps the
+    working set of a streaming query within a memory budget.
+
+    Args:
+        schema (pl.Schema): The schema of the frame being streamed.
+
+        memory_budget (int): The memory budget in bytes.
+
+    Returns:
+        int: The number of rows each streaming chunk should hold.
+    """
+
+    row_bytes = 0
+    for dtype in schema.dtypes():
+        if dtype == pl.Boolean:
+            row_bytes += 1
+        elif dtype.is_numeric() or dtype.is_temporal():
+            row_bytes += 8
+        else:
+            # strings and nested types, assume a modest average width
+            row_bytes += 32
+
+    # every thread in the pool holds its own chunk, and each operator in the
+    # pipeline may keep an input and an output chunk alive
+    in_flight = 2 * pl.thread_pool_size()
+
+    return max(1, memory_budget // (max(row_bytes, 1) * in_flight))
+
+
+def hash_columns(
+    columns: Iterable[str], dtypes: Optional[Dict[str, pl.DataType]] = None
+) -> pl.Expr:
+    """Hashes the given columns of each row into a single 64-bit value.
+
+    Args:
+        columns (Iterable): The names of the columns to hash.
+
+        dtypes (dict, optional): The types the columns are cast to before
+        hashing, keyed by column name. The hash depends on the types, tables
+        whose columns differ in type hash the same values alike once cast to a
+        common type.
+
+    Returns:
+        pl.Expr: An unsigned 64-bit hash expression. The columns are aliased
+        by position so that tables with different column names hash the same
+        values to the same value.
+    """
+    expressions = [pl.col(c) for c in columns]
+    if dtypes is not None:
+        expressions = [
+            e.cast(dtypes[e.meta.output_name()]) for e in expressions
+        ]
+
+    return pl.struct(
+        [e.alias("column_%d" % i) for i, e in enumerate(expressions)]
+    ).hash()
@@ -0,0 +1,36 @@
+import polars as pl
+from datarec import tables
+from datarec.data import TableReconciliationData
+
+
+def marketfee_left() -> pl.LazyFrame:
+    return pl.LazyFrame(
+        {
+            "settlementdate": ["1998-07-12"] * 4 + ["1998-07-13"] * 2,
+            "runno": [1, 1, 2, 2, 1, 1],
+            "periodid": [0, 1, 0, 1, 0, 1],
+            "sum_energy": [0.0, -4.66778, 1.5, 2.0, 3.0, None],
+            "sum_marketfeevalue": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        }
+    )
+
+
+def marketfee_right() -> pl.LazyFrame:
+    return pl.LazyFrame(
+        {
+            "settlementdate": ["1998-07-12"] * 4 + ["1998-07-14"] * 2,
+            "runno": [1, 1, 2, 2, 1, 1],
+            "periodid": [0, 1, 0, 1, 0, 1],
+            "sum_energy": [0.0, -4.66778, 1.5001, 2.5, 3.0, None],
+            "sum_marketfeevalue": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0],
+        }
+    )
+
+
+def marketfee_reconciliation(**kwargs) -> TableReconciliationData:
+    return tables.is_close_numeric(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=range(0, 3),
+        **kwargs
+    )
@@ -0,0 +1,75 @@
+import polars as pl
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+def _large(n=20000, shift=0):
+    return pl.LazyFrame(
+        dict(
+            key=range(n),
+            value=[float(i % 7 == 0) * shift + i for i in range(n)],
+        )
+    )
+
+
+def test_same_keys_are_sampled_on_both_sides():
+    reconciliation = tables.is_equal(
+        _large(),
+        _large(shift=1),
+        column_indexes=[0],
+        approximate=True,
+        sample_fraction=0.1,
+    )
+    results = reconciliation.results.collect()
+    assert 0 < len(results) < 20000
+    assert results["**BOTH**"].all()
+    assert reconciliation.sample_fraction == 0.1
+
+
+def test_keys_of_different_types_are_sampled_alike():
+    reconciliation = tables.is_equal(
+        _large(),
+        _large().with_columns(pl.col("key").cast(pl.Int32)),
+        column_indexes=[0],
+        approximate=True,
+        sample_fraction=0.1,
+    )
+    results = reconciliation.results.collect()
+    assert 0 < len(results) < 20000
+    assert results["**BOTH**"].all()
+
+
+def test_defaults_are_exact():
+    reconciliation = tables.is_close_numeric(
+        marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+    )
+    summary = tables.summarize_reconciliation(reconciliation)
+    assert reconciliation.sample_fraction == 1
+    assert summary.confidence_intervals is None
+    assert "Sampling" not in summary.to_dict()
+
+
+def test_intervals_contain_the_exact_ratio():
+    reconciliation = tables.is_equal(
+        _large(),
+        _large(shift=1),
+        column_indexes=[0],
+        approximate=True,
+        sample_fraction=0.1,
+    )
+    summary = tables.summarize_reconciliation(reconciliation, confidence=0.99)
+    assert summary.confidence_level == 0.99
+
+    for name in ["validation_ratio_entries", "validation_ratio_rows"]:
+        lower, upper = summary.confidence_intervals[name]
+        assert lower <= getattr(summary, name) <= upper
+        assert lower <= 6 / 7 <= upper
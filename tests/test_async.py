@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+import polars as pl
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+def _sorted(reconciliation):
+    return reconciliation.results.collect().sort(
+        reconciliation.columns_indexes
+    )
+
+
+@pytest.mark.parametrize("method", ["is_equal", "is_close_numeric"])
+def test_async_matches_sync(method):
+    async def reconcile():
+        reconciliation = await getattr(tables, method + "_async")(
+            marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+        )
+        summary = await tables.summarize_reconciliation_async(reconciliation)
+        return reconciliation, summary
+
+    reconciliation, summary = asyncio.run(reconcile())
+    expected = getattr(tables, method)(
+        marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+    )
+
+    assert _sorted(reconciliation).equals(_sorted(expected))
+    assert summary == tables.summarize_reconciliation(expected)
+
+
+def test_async_reconciliations_run_concurrently():
+    async def reconcile():
+        return await asyncio.gather(
+            tables.is_equal_async(
+                marketfee_left(), marketfee_right(), column_indexes=range(3)
+            ),
+            tables.is_close_numeric_async(
+                marketfee_left(), marketfee_right(), column_indexes=range(3)
+            ),
+        )
+
+    equal, close = asyncio.run(reconcile())
+    assert len(equal.results.collect()) == len(close.results.collect()) == 8
+
+
+def test_async_rejects_duplicated_indexes():
+    duplicated = pl.concat([marketfee_left(), marketfee_left().head(1)])
+
+    with pytest.raises(AssertionError, match="left df"):
+        asyncio.run(
+            tables.is_equal_async(
+                duplicated, marketfee_right(), column_indexes=range(0, 3)
+            )
+        )
@@ -0,0 +1,72 @@
+import polars as pl
+from datarec import batch, tables
+from datarec.data import ReconciliationJob
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+def test_run_batch_matches_single_runs():
+    jobs = [
+        ReconciliationJob(
+            name=method,
+            left=marketfee_left,
+            right=marketfee_right,
+            method=method,
+            column_indexes=[0, 1, 2],
+        )
+        for method in ["is_equal", "is_close_numeric"]
+    ]
+    outputs = batch.run_batch(jobs, max_workers=2)
+
+    assert list(outputs) == ["is_equal", "is_close_numeric"]
+
+    for method, (reconciliation, summary) in outputs.items():
+        expected = tables.summarize_reconciliation(
+            getattr(tables, method)(
+                marketfee_left(), marketfee_right(), column_indexes=range(3)
+            )
+        )
+        assert summary == expected
+        assert isinstance(reconciliation.results, pl.LazyFrame)
+        assert len(reconciliation.results.collect()) == 8
+
+
+def test_load_jobs(tmp_path):
+    marketfee_left().sink_parquet(tmp_path / "left.parquet")
+    (tmp_path / "jobs.yaml").write_text(
+        "\n".join(
+            [
+                "defaults:",
+                "  method: is_close_numeric",
+                "  kwargs:",
+                "    a_tol: 0.01",
+                "jobs:",
+                "  - name: marketfee",
+                "    left: left.parquet",
+                "    right:",
+                "      factory: tests.synthetic:marketfee_right",
+                "    column_indexes: [0, 1, 2]",
+                "    join: inner",
+                "    kwargs:",
+                "      pl1_name: source",
+            ]
+        )
+    )
+
+    (job,) = batch.load_jobs(tmp_path / "jobs.yaml")
+
+    assert job.method == "is_close_numeric"
+    assert job.join == "inner"
+    assert job.kwargs == dict(a_tol=0.01, pl1_name="source")
+
+    reconciliation, summary = batch.run_batch([job])["marketfee"]
+    assert reconciliation.left == "SOURCE"
+    assert summary.n_tested_rows == 4
@@ -0,0 +1,98 @@
+import polars as pl
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+def _reconcile(cache_dir, right=marketfee_right, **kwargs):
+    return tables.reconcile_cached(
+        marketfee_left(),
+        right(),
+        cache_dir,
+        method="is_close_numeric",
+        column_indexes=range(0, 3),
+        **kwargs
+    )
+
+
+def test_cache_hit_reads_the_stored_results(tmp_path):
+    reconciliation, summary = _reconcile(tmp_path)
+    assert len(list(tmp_path.glob("*.datarec.arrow"))) == 1
+
+    cached, cached_summary = _reconcile(tmp_path)
+    assert cached_summary == summary
+    assert cached.columns_tested == reconciliation.columns_tested
+    assert "IPC" in cached.results.explain().upper()
+    assert cached.results.collect().equals(reconciliation.results.collect())
+
+
+def test_parameters_and_data_change_the_key(tmp_path):
+    _reconcile(tmp_path)
+    # passing a default value explicitly reuses the entry
+    _reconcile(tmp_path, a_tol=10e-3)
+    assert len(list(tmp_path.glob("*.datarec.arrow"))) == 1
+
+    _reconcile(tmp_path, a_tol=1)
+    assert len(list(tmp_path.glob("*.datarec.arrow"))) == 2
+
+    def changed():
+        return marketfee_right().with_columns(pl.col("sum_energy") * 2)
+
+    _, summary = _reconcile(tmp_path, right=changed, fingerprint="data")
+    assert len(list(tmp_path.glob("*.datarec.arrow"))) == 3
+    assert summary.n_tested_entries_failed > 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    _reconcile(tmp_path)
+    size = sum(p.stat().st_size for p in tmp_path.iterdir())
+
+    _reconcile(tmp_path, a_tol=1, max_bytes=int(1.5 * size))
+    assert len(list(tmp_path.glob("*.datarec.arrow"))) == 1
+
+    # an entry larger than the cache is still returned
+    reconciliation, _ = _reconcile(tmp_path, a_tol=2, max_bytes=0)
+    assert len(reconciliation.results.collect()) == 8
+    assert len(list(tmp_path.glob("*.datarec.arrow"))) == 0
+
+
+def test_files_rewritten_in_place_miss_the_cache(tmp_path):
+    path = tmp_path / "right.parquet"
+    marketfee_right().sink_parquet(path)
+    _, summary = _reconcile(tmp_path, right=lambda: pl.scan_parquet(path))
+
+    marketfee_right().with_columns(pl.col("sum_energy") * 2).sink_parquet(path)
+    _, changed = _reconcile(tmp_path, right=lambda: pl.scan_parquet(path))
+
+    assert changed.n_tested_entries_failed > summary.n_tested_entries_failed
+
+
+def test_eviction_leaves_other_files_alone(tmp_path):
+    (tmp_path / "notes.json").write_text("{}")
+    (tmp_path / "data.arrow").write_bytes(b"")
+
+    _reconcile(tmp_path, max_bytes=0)
+
+    assert (tmp_path / "notes.json").exists()
+    assert (tmp_path / "data.arrow").exists()
+
+
+def test_reordered_rows_miss_the_cache_without_an_index(tmp_path):
+    def positional(right):
+        return tables.reconcile_cached(
+            marketfee_left(), right, tmp_path, method="is_equal"
+        )
+
+    _, summary = positional(marketfee_left())
+    _, reordered = positional(marketfee_left().reverse())
+
+    assert summary.n_tested_entries_failed == 0
+    assert reordered.n_tested_entries_failed > 0
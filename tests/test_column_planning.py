@@ -0,0 +1,39 @@
+import polars as pl
+from datarec import tables
+from datarec.utils.functions import get_prefixes, group_suffixed
+
+
+def test_group_suffixed_keeps_first_prefix_order():
+    columns = [
+        "K",
+        "A ~LEFT~",
+        "B ~LEFT~",
+        "A ~RIGHT~",
+        "B ~RIGHT~",
+        "A ~*VALIDATION*~",
+        "B ~*VALIDATION*~",
+    ]
+    assert get_prefixes(columns, " ~.+?~") == ["K", "A", "B"]
+    assert group_suffixed(columns) == [
+        "K",
+        "A ~LEFT~",
+        "A ~RIGHT~",
+        "A ~*VALIDATION*~",
+        "B ~LEFT~",
+        "B ~RIGHT~",
+        "B ~*VALIDATION*~",
+    ]
+
+
+def test_wide_tables_are_planned():
+    n_columns = 2000
+    p = pl.LazyFrame(
+        {"key": [0, 1]}
+        | {"column_%d" % i: [0.0, 1.0] for i in range(n_columns)}
+    )
+    reconciliation = tables.is_close_numeric(
+        p, p, column_indexes=[0], columns_to_ignore=[0], materialize="never"
+    )
+    assert len(reconciliation.columns_tested) == n_columns - 1
+    assert reconciliation.columns_ignored == ["COLUMN_0"]
+    assert len(reconciliation.validation_columns) == n_columns - 1
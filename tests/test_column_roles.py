@@ -0,0 +1,51 @@
+import polars as pl
+from datarec.data import ColumnRoles
+
+try:
+    from tests.synthetic import marketfee_reconciliation
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_reconciliation
+
+
+def test_roles_match_the_result_columns():
+    reconciliation = marketfee_reconciliation()
+    columns = reconciliation.results.collect_schema().names()
+    roles = reconciliation.roles
+
+    assert roles.is_left == "**LEFT**"
+    assert roles.is_right == "**RIGHT**"
+    assert roles.is_both == "**BOTH**"
+    assert list(roles.validation) == [
+        c for c in columns if "~*VALIDATION*~" in c
+    ]
+    assert list(roles.left) == [c for c in columns if " ~LEFT~" in c]
+    assert roles.tested["SUM_ENERGY"] == (
+        "SUM_ENERGY ~LEFT~",
+        "SUM_ENERGY ~RIGHT~",
+        "SUM_ENERGY ~*VALIDATION*~",
+    )
+
+
+def test_roles_are_rebuilt_from_the_schema():
+    reconciliation = marketfee_reconciliation(column_case="lower")
+    rebuilt = ColumnRoles.from_columns(
+        reconciliation.results.collect_schema().names(), "left", "right"
+    )
+    assert rebuilt == reconciliation.roles
+
+
+def test_accessors_do_not_resolve_the_schema():
+    reconciliation = marketfee_reconciliation()
+    validation = reconciliation.validation_columns
+
+    # a plan which fails on schema resolution
+    reconciliation.results = pl.LazyFrame({"a": [1]}).select(pl.col("b"))
+
+    assert reconciliation.validation_columns == validation
+    assert reconciliation.is_intersection_col == "**BOTH**"
+    assert len(reconciliation.right_columns) == 2
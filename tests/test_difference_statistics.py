@@ -0,0 +1,45 @@
+import polars as pl
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_reconciliation
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_reconciliation
+
+
+def test_difference_statistics_match_the_results():
+    reconciliation = marketfee_reconciliation()
+    statistics = tables.difference_statistics(reconciliation)
+    results = reconciliation.results.collect()
+
+    assert set(statistics["column"]) <= set(reconciliation.columns_tested)
+    assert len(statistics) > 0
+
+    for row in statistics.iter_rows(named=True):
+        left, right, _ = reconciliation.roles.tested[row["column"]]
+        difference = (
+            results[left].cast(pl.Float64) - results[right].cast(pl.Float64)
+        ).abs()
+
+        assert row["n_compared"] == difference.drop_nulls().len()
+        assert row["max_abs_diff"] == difference.max()
+        assert abs(row["mean_abs_diff"] - difference.mean()) < 1e-12
+        assert sum(row["rel_diff_histogram"]) == row["n_compared"]
+
+
+def test_difference_statistics_histogram_bins():
+    statistics = tables.difference_statistics(
+        marketfee_reconciliation(), bins=[1e-3, 1e-1]
+    )
+
+    for row in statistics.iter_rows(named=True):
+        histogram = row["rel_diff_histogram"]
+        assert len(histogram) == 3
+        # the relative differences above r_tol are the failures
+        if row["max_rel_diff"] < 1e-3:
+            assert histogram[1:] == [0, 0]
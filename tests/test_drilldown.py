@@ -0,0 +1,88 @@
+import polars as pl
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+index = ["SETTLEMENTDATE", "RUNNO", "PERIODID"]
+
+
+def _failed_keys(reconciliation):
+    return set(
+        reconciliation.get_failures().select(index).collect().rows()
+    ) | set(
+        reconciliation.get_results_union()
+        .filter(pl.col("**BOTH**").not_())
+        .select(index)
+        .collect()
+        .rows()
+    )
+
+
+def test_identical_tables_stop_at_the_first_level():
+    drilldown = tables.reconcile_drilldown(
+        marketfee_left(), marketfee_left(), column_indexes=range(0, 3)
+    )
+    assert drilldown.results is None
+    assert len(drilldown.levels) == 1
+    assert drilldown.groups_mismatched[0].is_empty()
+
+
+def test_drilldown_finds_every_failure():
+    full = tables.is_close_numeric(
+        marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+    )
+    for levels in [None, [1], [2]]:
+        for digest_numeric in [False, True]:
+            drilldown = tables.reconcile_drilldown(
+                marketfee_left(),
+                marketfee_right(),
+                column_indexes=range(0, 3),
+                levels=levels,
+                digest_numeric=digest_numeric,
+            )
+            assert _failed_keys(drilldown.results) == _failed_keys(full)
+
+
+def test_drilldown_expands_only_mismatched_groups():
+    drilldown = tables.reconcile_drilldown(
+        marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+    )
+    coarse, fine = drilldown.groups_mismatched
+    n_rows = len(drilldown.results.results.collect())
+
+    assert len(drilldown.levels) == 2
+    # a group is only expanded when its coarser group mismatched
+    assert set(fine["SETTLEMENTDATE"]) <= set(coarse["SETTLEMENTDATE"])
+    assert n_rows < len(
+        tables.is_close_numeric(
+            marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+        ).results.collect()
+    )
+
+
+def test_drilldown_finds_differences_hidden_in_the_sums():
+    # a difference small next to the sum of its group, and a missing value
+    # against a zero which the sums skip
+    keys = dict(a=[1, 1, 1, 1, 2, 2], b=[1, 2, 3, 4, 1, 2])
+    left = pl.LazyFrame(dict(keys, v=[1000.0, 1.0, 1.0, 1.0, 1.0, None]))
+    right = pl.LazyFrame(dict(keys, v=[1000.0, 1.5, 1.0, 1.0, 1.0, 0.0]))
+
+    full = tables.is_close_numeric(left, right, column_indexes=range(0, 2))
+    drilldown = tables.reconcile_drilldown(
+        left, right, column_indexes=range(0, 2)
+    )
+
+    failed = full.get_failures().select("A", "B").collect().rows()
+    assert sorted(failed) == [(1, 2), (2, 2)]
+    assert drilldown.results is not None
+    assert sorted(
+        drilldown.results.get_failures().select("A", "B").collect().rows()
+    ) == sorted(failed)
@@ -0,0 +1,54 @@
+import polars as pl
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_reconciliation
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_reconciliation
+
+
+def test_get_failures_returns_every_failed_row():
+    reconciliation = marketfee_reconciliation()
+    failures = reconciliation.get_failures().collect()
+    validation = reconciliation.validation_columns
+
+    assert len(failures) == 5
+    assert not failures.select(pl.all_horizontal(validation)).to_series().any()
+
+
+def test_get_failures_ranks_by_failure_count():
+    reconciliation = marketfee_reconciliation()
+    failures = reconciliation.get_failures(limit=2).collect()
+    n_failed = failures.select(
+        pl.sum_horizontal(
+            [pl.col(c).not_() for c in reconciliation.validation_columns]
+        )
+    ).to_series()
+
+    assert len(failures) == 2
+    assert (n_failed == 2).all()
+
+
+def test_get_failures_skips_the_result_sorts():
+    plan = marketfee_reconciliation().get_failures(limit=2).explain()
+    # the top-k selection is the only, sliced, sort in the plan
+    assert plan.count("SORT BY") == 1
+    assert "SORT BY [slice" in plan
+
+
+def test_get_failures_counts_missing_validations_as_failed():
+    left = pl.LazyFrame(dict(k=[1, 2, 3], v=[5, None, 1]))
+    right = pl.LazyFrame(dict(k=[1, 2, 3], v=[None, 5, 1]))
+    reconciliation = tables.is_equal(left, right, column_indexes=[0])
+
+    summary = tables.summarize_reconciliation(reconciliation)
+    failures = reconciliation.get_failures().collect()
+
+    assert len(failures) == summary.n_tested_rows_failed == 2
+    assert sorted(failures["K"]) == [1, 2]
+    assert len(reconciliation.get_failures(limit=5).collect()) == 2
@@ -0,0 +1,42 @@
+import pytest
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+@pytest.mark.parametrize("column_indexes", [range(0, 3), None])
+def test_hash_first_matches_is_equal(column_indexes):
+    expected = tables.is_equal(
+        marketfee_left(), marketfee_right(), column_indexes=column_indexes
+    )
+    validation = tables.is_equal(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=column_indexes,
+        hash_first=True,
+    )
+    assert tables.summarize_all(validation) == tables.summarize_all(expected)
+
+
+def test_hash_first_skips_identical_payload():
+    validation = tables.is_equal(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=range(0, 3),
+        hash_first=True,
+    )
+    results = validation.get_results_intersection().collect()
+    identical = results.filter(results["SUM_ENERGY ~LEFT~"].is_null())
+    assert len(identical) == 2
+    assert identical["SUM_ENERGY ~*VALIDATION*~"].all()
+
+    left_only = validation.get_rows_left_only().collect()
+    assert left_only["SETTLEMENTDATE"].to_list() == ["1998-07-13"] * 2
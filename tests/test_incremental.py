@@ -0,0 +1,55 @@
+import polars as pl
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+def test_incremental_reuses_unchanged_partitions(tmp_path):
+    state_path = tmp_path / "state.json"
+    kwargs = dict(
+        column_indexes=range(0, 3),
+        partition_indexes=[0],
+        state_path=state_path,
+        method="is_close_numeric",
+    )
+    expected = tables.summarize_reconciliation(
+        tables.is_close_numeric(
+            marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+        )
+    )
+
+    first = tables.reconcile_incremental(
+        marketfee_left(), marketfee_right(), **kwargs
+    )
+    assert len(first.partitions_changed) == 3
+    assert first.summary == expected
+
+    second = tables.reconcile_incremental(
+        marketfee_left(), marketfee_right(), **kwargs
+    )
+    assert second.partitions_changed == []
+    assert second.results is None
+    assert second.summary == expected
+
+    changed_right = marketfee_right().with_columns(
+        pl.when(pl.col("settlementdate") == "1998-07-14")
+        .then(pl.col("sum_marketfeevalue") + 1)
+        .otherwise(pl.col("sum_marketfeevalue"))
+    )
+    third = tables.reconcile_incremental(
+        marketfee_left(), changed_right, **kwargs
+    )
+    assert third.partitions_changed == [["1998-07-14"]]
+    assert third.summary == tables.summarize_reconciliation(
+        tables.is_close_numeric(
+            marketfee_left(), changed_right, column_indexes=range(0, 3)
+        )
+    )
@@ -0,0 +1,67 @@
+import pytest
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+@pytest.mark.parametrize("materialize", ["never", "join", "auto"])
+def test_materialize_matches_eager(materialize):
+    expected = tables.is_equal(
+        marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+    )
+    validation = tables.is_equal(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=range(0, 3),
+        materialize=materialize,
+    )
+    by = validation.columns_indexes
+    assert (
+        validation.results.collect()
+        .sort(by)
+        .equals(expected.results.collect().sort(by))
+    )
+
+
+def test_materialize_never_keeps_plan_lazy():
+    validation = tables.is_close_numeric(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=range(0, 3),
+        materialize="never",
+    )
+    assert "DF [" in validation.results.explain()
+
+
+def test_right_only_rows_keep_index():
+    validation = tables.is_equal(
+        marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+    )
+    right_only = validation.get_rows_right_only().collect()
+    assert right_only["SETTLEMENTDATE"].to_list() == ["1998-07-14"] * 2
+
+
+def test_materialize_auto_reuses_repeated_results():
+    validation = tables.is_equal(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=range(0, 3),
+        materialize="auto",
+    )
+    plan = validation.results
+
+    # a single use runs the lazy plan
+    assert validation.get_results_union() is plan
+    # the second use materializes the results, later uses reuse them
+    materialized = validation.get_results_left()
+    assert validation.results is not plan
+    assert validation.get_results_union() is validation.results
+    assert "JOIN" not in materialized.explain()
@@ -0,0 +1,94 @@
+import os
+import asyncio
+
+import polars as pl
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_reconciliation
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_reconciliation
+
+
+def _sorted(lf):
+    return lf.collect().sort(["SETTLEMENTDATE", "RUNNO", "PERIODID"])
+
+
+def test_results_are_materialized_once():
+    reconciliation = marketfee_reconciliation(materialize="never")
+    expected = _sorted(reconciliation.results)
+    plan = reconciliation.results
+
+    reconciliation.memoize()
+    # nothing is materialized until the results are used
+    assert reconciliation.results is plan
+
+    assert _sorted(reconciliation.get_results_union()).equals(expected)
+    assert reconciliation.results is not plan
+    assert "DF [" in reconciliation.get_results_left().explain()
+    assert len(reconciliation.get_rows_right_only().collect()) == 2
+    assert tables.summarize_reconciliation(
+        reconciliation
+    ) == tables.summarize_reconciliation(
+        marketfee_reconciliation(materialize="never")
+    )
+
+    reconciliation.release()
+    assert reconciliation.results is plan
+
+
+def test_results_over_the_budget_are_spilled():
+    reconciliation = marketfee_reconciliation(materialize="never").memoize(
+        memory_budget=0
+    )
+    expected = _sorted(marketfee_reconciliation(materialize="never").results)
+
+    results = reconciliation.get_results_union()
+    path = reconciliation._spill.peek()[2][0]
+
+    assert os.path.exists(path)
+    assert "IPC" in results.explain().upper()
+    assert _sorted(results).equals(expected)
+
+    reconciliation.release()
+    assert not os.path.exists(path)
+
+
+def test_results_within_the_budget_stay_in_memory(tmp_path):
+    path = tmp_path / "results.arrow"
+    marketfee_reconciliation(materialize="never").results.sink_ipc(path)
+    size = os.path.getsize(path)
+
+    # the results are only held in memory when they fit in the budget
+    for budget, in_memory in [(size, True), (size - 1, False)]:
+        reconciliation = marketfee_reconciliation(materialize="never").memoize(
+            memory_budget=budget
+        )
+        results = reconciliation.get_results_union()
+
+        assert (reconciliation._spill is None) == in_memory
+        assert ("IPC" not in results.explain().upper()) == in_memory
+        assert isinstance(
+            reconciliation.get_failures().collect(), pl.DataFrame
+        )
+        reconciliation.release()
+
+
+def test_async_summary_of_memoized_results():
+    reconciliation = marketfee_reconciliation(materialize="never").memoize(
+        memory_budget=0
+    )
+    summary = asyncio.run(
+        tables.summarize_reconciliation_async(reconciliation)
+    )
+
+    assert reconciliation._spill is not None
+    assert summary == tables.summarize_reconciliation(
+        marketfee_reconciliation(materialize="never")
+    )
+    reconciliation.release()
@@ -0,0 +1,53 @@
+import polars as pl
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+def test_identical_tables_have_no_mismatched_ranges():
+    merkle = tables.reconcile_merkle(
+        marketfee_left(), marketfee_left(), column_indexes=range(0, 3)
+    )
+    assert merkle.ranges_mismatched == []
+    assert merkle.results is None
+    assert merkle.n_rows_matched_left == 6
+
+
+def test_only_mismatched_ranges_are_reconciled():
+    merkle = tables.reconcile_merkle(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=range(0, 3),
+        method="is_close_numeric",
+        depth=20,
+    )
+    results = merkle.results.results.collect()
+    assert 0 < len(results) < 8
+    assert merkle.n_rows_matched_left + len(
+        results.filter(pl.col("**LEFT**"))
+    ) == 6
+
+
+def test_precomputed_digests():
+    digests_1 = tables.range_digests(marketfee_left(), range(0, 3), depth=8)
+    digests_2 = tables.range_digests(marketfee_right(), range(0, 3), depth=8)
+    mismatched = tables.compare_range_digests(
+        digests_1.collect(), digests_2.collect(), depth=8
+    )
+    merkle = tables.reconcile_merkle(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=range(0, 3),
+        depth=8,
+        digests_1=digests_1,
+        digests_2=digests_2,
+    )
+    assert merkle.ranges_mismatched == mismatched
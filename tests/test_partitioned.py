@@ -0,0 +1,57 @@
+import pickle
+
+import polars as pl
+from datarec import tables
+from datarec.tables._partitioned import _split
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+def test_partitioned_matches_single_process(tmp_path):
+    expected = tables.is_close_numeric(
+        marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+    )
+
+    for results_dir in [None, tmp_path]:
+        reconciliation, summary = tables.reconcile_partitioned(
+            marketfee_left(),
+            marketfee_right(),
+            column_indexes=range(0, 3),
+            method="is_close_numeric",
+            n_partitions=3,
+            max_workers=2,
+            results_dir=results_dir,
+        )
+
+        assert summary == tables.summarize_reconciliation(expected)
+        assert (
+            reconciliation.results.collect().shape
+            == expected.results.collect().shape
+        )
+
+
+def test_workers_only_receive_their_partition(tmp_path):
+    keys = ["settlementdate", "runno", "periodid"]
+    in_memory = _split(marketfee_left(), keys, 3)
+
+    n_rows = [len(p.collect()) for p in in_memory]
+    assert sum(n_rows) == len(marketfee_left().collect())
+    assert max(n_rows) < sum(n_rows)
+    for partition in in_memory:
+        assert len(pickle.dumps(partition)) < len(
+            pickle.dumps(marketfee_left())
+        )
+
+    path = tmp_path / "left.parquet"
+    marketfee_left().sink_parquet(path)
+    scanned = _split(pl.scan_parquet(path), keys, 3)
+    assert all("DF [" not in p.explain() for p in scanned)
+    assert [len(p.collect()) for p in scanned] == n_rows
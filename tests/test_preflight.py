@@ -0,0 +1,146 @@
+import asyncio
+
+import polars as pl
+import pytest
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+index = ["SETTLEMENTDATE", "RUNNO", "PERIODID"]
+
+
+def test_preflight_verdicts():
+    differing = tables.preflight(
+        marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+    )
+    identical = tables.preflight(
+        marketfee_left(),
+        marketfee_left().reverse(),
+        column_indexes=range(0, 3),
+    )
+    shorter = tables.preflight(
+        marketfee_left(), marketfee_left().head(3), column_indexes=range(0, 3)
+    )
+    retyped = tables.preflight(
+        marketfee_left(),
+        marketfee_left().with_columns(pl.col("runno").cast(pl.String)),
+        column_indexes=range(0, 3),
+    )
+    widened = tables.preflight(
+        marketfee_left(),
+        marketfee_left().with_columns(pl.col("runno").cast(pl.Float64)),
+        column_indexes=range(0, 3),
+    )
+
+    assert differing.verdict == "unknown"
+    assert "SUM_ENERGY" in differing.columns_differing
+    assert "SUM_MARKETFEEVALUE" not in differing.columns_differing
+    assert identical.verdict == "pass"
+    assert shorter.verdict == "fail"
+    assert retyped.verdict == "fail"
+    assert retyped.columns_mismatched == ["RUNNO"]
+    # numeric columns of different types may still reconcile
+    assert widened.verdict == "unknown"
+    assert widened.columns_mismatched == ["RUNNO"]
+    assert "RUNNO" not in widened.columns_differing
+
+
+def test_preflight_without_index_is_order_sensitive():
+    reordered = tables.preflight(marketfee_left(), marketfee_left().reverse())
+    assert reordered.verdict == "unknown"
+
+
+def test_preflight_skip_matches_the_full_join():
+    # is_close_numeric cannot compare the string column without an index
+    for method, column_indexes in [
+        (tables.is_equal, range(0, 3)),
+        (tables.is_equal, None),
+        (tables.is_close_numeric, range(0, 3)),
+    ]:
+        skipped = method(
+            marketfee_left(),
+            marketfee_left(),
+            column_indexes=column_indexes,
+            preflight="skip",
+            materialize="never",
+        )
+        joined = method(
+            marketfee_left(),
+            marketfee_left(),
+            column_indexes=column_indexes,
+        )
+
+        assert skipped.preflight.verdict == "pass"
+        assert "JOIN" not in skipped.results.explain()
+
+        by = index if column_indexes is not None else ["row_number"]
+        assert (
+            skipped.results.sort(by)
+            .collect()
+            .equals(joined.results.sort(by).collect())
+        )
+
+
+def test_preflight_check_keeps_the_join():
+    reconciliation = tables.is_equal(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=range(0, 3),
+        preflight="check",
+    )
+    assert reconciliation.preflight.verdict == "unknown"
+    assert len(reconciliation.get_failures().collect()) > 0
+
+
+def test_preflight_async():
+    reconciliation = asyncio.run(
+        tables.is_equal_async(
+            marketfee_left(),
+            marketfee_left(),
+            column_indexes=range(0, 3),
+            preflight="skip",
+        )
+    )
+    assert reconciliation.preflight.verdict == "pass"
+
+
+def test_preflight_stop_exits_before_the_join():
+    with pytest.raises(AssertionError, match="preflight failed"):
+        tables.is_equal(
+            marketfee_left(),
+            marketfee_left().head(3),
+            column_indexes=range(0, 3),
+            preflight="stop",
+        )
+
+    stopped = tables.is_equal(
+        marketfee_left(),
+        marketfee_left(),
+        column_indexes=range(0, 3),
+        preflight="stop",
+        materialize="never",
+    )
+    assert stopped.preflight.verdict == "pass"
+    assert "JOIN" not in stopped.results.explain()
+
+
+def test_preflight_skip_keeps_the_ignored_columns():
+    for column_indexes in [range(0, 3), None]:
+        kwargs = dict(column_indexes=column_indexes, columns_to_ignore=[0])
+        skipped = tables.is_equal(
+            marketfee_left(), marketfee_left(), preflight="skip", **kwargs
+        )
+        joined = tables.is_equal(marketfee_left(), marketfee_left(), **kwargs)
+
+        assert skipped.preflight.verdict == "pass"
+        assert skipped.results.collect_schema() == (
+            joined.results.collect_schema()
+        )
@@ -0,0 +1,117 @@
+import datetime as dt
+
+import polars as pl
+import pytest
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+def _mixed():
+    left = pl.LazyFrame(
+        dict(
+            key=[1, 2, 3],
+            name=["a", "b", "c"],
+            runno=[1, 2, 3],
+            amount=[1.0, 2.0, 3.0],
+            stamp=[dt.datetime(2024, 1, 1, 0, 0, s) for s in range(3)],
+        )
+    )
+    right = pl.LazyFrame(
+        dict(
+            key=[1, 2, 3],
+            name=["a", "b", "x"],
+            runno=[1, 2, 4],
+            amount=[1.0, 2.001, 3.5],
+            stamp=[dt.datetime(2024, 1, 1, 0, 0, s) for s in [0, 2, 4]],
+        )
+    )
+    return left, right
+
+
+def _passed(reconciliation):
+    results = reconciliation.results.sort("KEY").collect()
+    return {
+        c.split(" ")[0]: results[c].to_list()
+        for c in reconciliation.validation_columns
+    }
+
+
+def test_reconcile_matches_is_close_numeric_on_floats():
+    kwargs = dict(column_indexes=range(0, 3))
+    mixed = tables.reconcile(marketfee_left(), marketfee_right(), **kwargs)
+    numeric = tables.is_close_numeric(
+        marketfee_left(), marketfee_right(), **kwargs
+    )
+    index = ["SETTLEMENTDATE", "RUNNO", "PERIODID"]
+
+    assert (
+        mixed.results.sort(index)
+        .collect()
+        .equals(numeric.results.sort(index).collect())
+    )
+
+
+def test_reconcile_picks_the_comparator_from_the_type():
+    left, right = _mixed()
+    passed = _passed(
+        tables.reconcile(
+            left,
+            right,
+            column_indexes=[0],
+            time_tol=dt.timedelta(seconds=1),
+        )
+    )
+
+    assert passed["NAME"] == [True, True, False]
+    assert passed["RUNNO"] == [True, True, False]
+    assert passed["AMOUNT"] == [True, True, False]
+    assert passed["STAMP"] == [True, True, False]
+
+
+def test_reconcile_column_options():
+    left, right = _mixed()
+    passed = _passed(
+        tables.reconcile(
+            left,
+            right,
+            column_indexes=[0],
+            column_options=dict(
+                amount=dict(a_tol=1.0),
+                runno=dict(comparator="tolerance", r_tol=0.5),
+                stamp=dict(time_tol=dt.timedelta(seconds=2)),
+            ),
+        )
+    )
+
+    assert passed["AMOUNT"] == [True, True, True]
+    assert passed["RUNNO"] == [True, True, True]
+    assert passed["STAMP"] == [True, True, True]
+
+
+def test_reconcile_rejects_unknown_columns():
+    left, right = _mixed()
+    with pytest.raises(AssertionError):
+        tables.reconcile(
+            left, right, column_indexes=[0], column_options=dict(nope={})
+        )
+
+
+def test_reconcile_compares_decimals_on_either_side_within_tolerance():
+    decimal = pl.LazyFrame(
+        dict(key=[1, 2], amount=[1.001, 2.5]),
+        schema=dict(key=pl.Int64, amount=pl.Decimal(10, 3)),
+    )
+    integer = pl.LazyFrame(dict(key=[1, 2], amount=[1, 2]))
+
+    for left, right in [(decimal, integer), (integer, decimal)]:
+        passed = _passed(tables.reconcile(left, right, column_indexes=[0]))
+        assert passed["AMOUNT"] == [True, False]
@@ -0,0 +1,55 @@
+import pytest
+from datarec import tables
+from datarec.data import TableReconciliationData
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+@pytest.mark.parametrize("name", ["results.parquet", "results.arrow"])
+def test_save_and_load(tmp_path, name):
+    reconciliation = tables.is_close_numeric(
+        marketfee_left(),
+        marketfee_right(),
+        pl1_name="source",
+        pl2_name="target",
+        column_indexes=range(0, 3),
+    )
+    reconciliation.save(tmp_path / name)
+
+    loaded = TableReconciliationData.load(tmp_path / name)
+
+    assert loaded.left == "SOURCE"
+    assert loaded.columns_indexes == reconciliation.columns_indexes
+    assert loaded.columns_tested == reconciliation.columns_tested
+    assert loaded.roles == reconciliation.roles
+    assert loaded.results.collect().equals(reconciliation.results.collect())
+    assert (
+        loaded.get_rows_left_only()
+        .collect()
+        .equals(reconciliation.get_rows_left_only().collect())
+    )
+    assert tables.summarize_reconciliation(
+        loaded
+    ) == tables.summarize_reconciliation(reconciliation)
+
+
+def test_sunk_results_can_be_loaded(tmp_path):
+    reconciliation = tables.is_equal(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=range(0, 3),
+        streaming=True,
+    )
+    summary = reconciliation.sink(tmp_path / "results.arrow")
+    loaded = TableReconciliationData.load(tmp_path / "results.arrow")
+
+    assert loaded.streaming
+    assert tables.summarize_reconciliation(loaded) == summary
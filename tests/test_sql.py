@@ -0,0 +1,104 @@
+import sqlite3
+
+import polars as pl
+import pytest
+from datarec import sql, tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+index = ["SETTLEMENTDATE", "RUNNO", "PERIODID"]
+
+
+def _database():
+    connection = sqlite3.connect(":memory:")
+    for name, lf in [("lhs", marketfee_left()), ("rhs", marketfee_right())]:
+        df = lf.collect()
+        connection.execute(
+            "CREATE TABLE %s (%s)" % (name, ", ".join(df.columns))
+        )
+        connection.executemany(
+            "INSERT INTO %s VALUES (%s)"
+            % (name, ", ".join("?" * len(df.columns))),
+            df.rows(),
+        )
+    return sql.sqlite_fetch(connection)
+
+
+def test_identical_queries_fetch_no_rows():
+    fetch = _database()
+    fetched = []
+
+    def spy(query):
+        fetched.append(query)
+        return fetch(query)
+
+    digests = sql.reconcile_sql(
+        "SELECT * FROM lhs", "SELECT * FROM lhs", spy, spy, range(0, 3)
+    )
+
+    assert digests.results is None
+    assert digests.buckets_mismatched == []
+    assert digests.n_rows_matched_left == 6
+    # the columns and the digests of both queries, no rows
+    assert len(fetched) == 4
+
+
+def test_mismatched_buckets_match_the_full_reconciliation():
+    fetch = _database()
+    digests = sql.reconcile_sql(
+        "SELECT * FROM lhs",
+        "SELECT * FROM rhs",
+        fetch,
+        fetch,
+        range(0, 3),
+        n_buckets=4096,
+        method="is_close_numeric",
+    )
+    full = tables.is_close_numeric(
+        marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+    )
+
+    def failed(reconciliation):
+        return set(
+            reconciliation.get_failures().select(index).collect().rows()
+        )
+
+    assert len(digests.buckets_mismatched) > 0
+    assert failed(digests.results) == failed(full)
+    assert (
+        digests.n_rows_matched_left
+        + len(digests.results.results.filter(pl.col("**LEFT**")).collect())
+        == 6
+    )
+
+
+def test_rows_sql_splits_long_in_lists():
+    query = sql.rows_sql("SELECT * FROM lhs", ["runno"], range(2500))
+    assert query.count(" IN (") == 3
+
+
+def test_unknown_dialect():
+    with pytest.raises(AssertionError):
+        sql.digest_sql("SELECT 1", ["a"], ["a"], dialect="mysql")
+
+
+def test_generated_sql_runs_on_sqlite():
+    fetch = _database()
+    digests = fetch(
+        sql.digest_sql(
+            "SELECT * FROM lhs",
+            ["settlementdate", "runno", "periodid", "sum_energy"],
+            ["settlementdate"],
+            n_buckets=8,
+        )
+    )
+    assert digests["n_rows"].sum() == 6
+    assert digests["bucket"].is_between(0, 7).all()
@@ -0,0 +1,76 @@
+import numpy as np
+import polars as pl
+import pytest
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+@pytest.mark.parametrize("file_name", ["results.parquet", "results.arrow"])
+def test_sink_writes_results(tmp_path, file_name):
+    validation = tables.is_close_numeric(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=range(0, 3),
+        streaming=True,
+    )
+    validation.sink(tmp_path / file_name, join=None, memory_budget=1 << 20)
+
+    if file_name.endswith(".parquet"):
+        written = pl.read_parquet(tmp_path / file_name)
+    else:
+        written = pl.read_ipc(tmp_path / file_name)
+
+    assert written.shape == validation.results.collect().shape
+
+
+@pytest.mark.parametrize("join", ["left", "right", "inner", "outer"])
+def test_sink_summary_matches_summarizer(tmp_path, join):
+    validation = tables.is_equal(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=range(0, 3),
+        streaming=True,
+    )
+    streamed = validation.sink(tmp_path / "results.parquet", join=join)
+    expected = tables.summarize_reconciliation(validation, join)
+
+    assert streamed.n_tested_rows == expected.n_tested_rows
+    assert streamed.n_tested_entries_passed == expected.n_tested_entries_passed
+    assert streamed.n_total_rows_union == expected.n_total_rows_union
+    assert np.isclose(
+        streamed.stats_invalidations_per_row_std,
+        expected.stats_invalidations_per_row_std,
+    )
+
+
+def test_summaries_of_streaming_results_use_the_streaming_engine(
+    monkeypatch,
+):
+    validation = tables.is_equal(
+        marketfee_left(),
+        marketfee_right(),
+        column_indexes=range(0, 3),
+        streaming=True,
+    )
+    engines = []
+    collect = pl.LazyFrame.collect
+
+    def recording_collect(self, *args, **kwargs):
+        engines.append(kwargs.get("engine", "auto"))
+        return collect(self, *args, **kwargs)
+
+    monkeypatch.setattr(pl.LazyFrame, "collect", recording_collect)
+
+    tables.summarize_reconciliation(validation)
+    tables.summarize_all(validation)
+
+    assert engines == ["streaming", "streaming"]
@@ -0,0 +1,84 @@
+import numpy as np
+from datarec import tables
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+validation = tables.is_equal(
+    marketfee_left(), marketfee_right(), column_indexes=range(0, 3)
+)
+
+
+class TestSummarize:
+    def test_inner(self):
+        summary = tables.summarize_reconciliation(validation, "inner")
+        assert summary.n_tested_rows == 4
+        assert summary.n_tested_entries_passed == 6
+        assert summary.n_tested_rows_passed == 2
+        assert summary.n_tested_rows_passed_partially == 2
+        assert summary.n_tested_rows_failed == 0
+        assert np.isclose(summary.stats_invalidations_per_row_avg, 0.5)
+        assert np.isclose(summary.stats_invalidations_per_row_std, 0.5)
+
+    def test_outer(self):
+        summary = tables.summarize_reconciliation(validation, "outer")
+        assert summary.n_tested_rows == 8
+        assert summary.validation_ratio_entries == 0.5
+        assert summary.n_total_rows_left == 6
+        assert summary.n_total_rows_right == 6
+        assert summary.n_total_rows_intersecting == 4
+        assert summary.n_total_rows_union == 8
+
+    def test_no_tested_columns(self):
+        ignored = tables.is_equal(
+            marketfee_left(),
+            marketfee_right(),
+            column_indexes=range(0, 3),
+            columns_to_ignore=[0, 1],
+        )
+        summary = tables.summarize_reconciliation(ignored, "left")
+        assert summary.n_tested_cols == 0
+        assert summary.n_tested_entries == 0
+        assert summary.n_tested_rows == 6
+
+    def test_summarize_all(self):
+        summaries = tables.summarize_all(validation)
+        assert list(summaries) == ["left", "right", "inner", "outer"]
+        for join, summary in summaries.items():
+            expected = tables.summarize_reconciliation(validation, join)
+            assert summary == expected
+
+    def test_column_breakdown(self):
+        summary = tables.summarize_reconciliation(validation, "inner")
+        breakdown = summary.column_breakdown.rows_by_key(
+            "column", named=True, unique=True
+        )
+        assert list(breakdown) == ["SUM_ENERGY", "SUM_MARKETFEEVALUE"]
+        assert breakdown["SUM_ENERGY"]["n_failed"] == 2
+        assert breakdown["SUM_MARKETFEEVALUE"]["n_failed"] == 0
+        assert breakdown["SUM_ENERGY"]["n_null"] == 0
+        assert breakdown["SUM_ENERGY"]["failure_ratio"] == 0.5
+        assert (
+            summary.column_breakdown["n_failed"].sum()
+            == summary.n_tested_entries_failed
+        )
+        assert "Columns" in summary.to_dict()
+
+    def test_column_breakdown_of_merged_moments(self):
+        _, summary = tables.reconcile_partitioned(
+            marketfee_left(),
+            marketfee_right(),
+            column_indexes=range(0, 3),
+            n_partitions=2,
+            max_workers=1,
+        )
+        expected = tables.summarize_reconciliation(validation)
+        assert summary.column_breakdown.equals(expected.column_breakdown)
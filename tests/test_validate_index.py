@@ -0,0 +1,51 @@
+import pytest
+import polars as pl
+from datarec import tables
+from datarec.utils.functions import validate_indexes
+
+try:
+    from tests.synthetic import marketfee_left, marketfee_right
+except ImportError:
+    import sys
+    import pathlib as pt
+
+    cwd = pt.Path(__file__).parent.absolute()
+    sys.path.append(cwd.parent.absolute().as_posix())
+    from tests.synthetic import marketfee_left, marketfee_right
+
+
+def _duplicated():
+    return pl.concat([marketfee_right(), marketfee_right().head(1)])
+
+
+@pytest.mark.parametrize("validate_index", ["fast", "full"])
+def test_duplicated_indexes_are_rejected(validate_index):
+    with pytest.raises(AssertionError, match="right df"):
+        tables.is_equal(
+            marketfee_left(),
+            _duplicated(),
+            column_indexes=range(0, 3),
+            validate_index=validate_index,
+        )
+
+
+def test_validation_can_be_turned_off():
+    reconciliation = tables.is_equal(
+        marketfee_left(),
+        _duplicated(),
+        column_indexes=range(0, 3),
+        validate_index="off",
+    )
+    assert len(reconciliation.results.collect()) == 9
+
+
+def test_both_sides_are_counted():
+    counts = validate_indexes(
+        {"left": marketfee_left(), "right": marketfee_right()},
+        range(0, 3),
+        "fast",
+    )
+    assert counts == {"left": (6, 6), "right": (6, 6)}
+    assert validate_indexes(
+        {"left": marketfee_left()}, range(0, 3), "full"
+    ) == {"left": (6, 6)}